@@ -49,6 +49,10 @@ static yay_value_t *make_expected_array_inline_integers(void) {
     return YAY_ARRAY(yay_int(42), yay_int(404), yay_int(418));
 }
 
+static yay_value_t *make_expected_array_inline_nested_after_comma_string(void) {
+    return YAY_ARRAY(yay_string("a ,b"), YAY_ARRAY(yay_int(1)), YAY_ARRAY(yay_int(2)));
+}
+
 static yay_value_t *make_expected_array_inline_nested(void) {
     return YAY_ARRAY(
     YAY_ARRAY(yay_string("I feel happy!"), yay_string("yay.")),
@@ -684,6 +688,7 @@ static test_fixture_t test_fixtures[] = {
     {"array_inline_doublequote_escapes", "[\"say \\\"hi\\\"\", \"x\"]\n", make_expected_array_inline_doublequote_escapes},
     {"array_inline_doublequote", "[\"And there was much rejoicing.\", \"yay.\"]\n", make_expected_array_inline_doublequote},
     {"array_inline_integers", "[42, 404, 418]\n", make_expected_array_inline_integers},
+    {"array_inline_nested_after_comma_string", "[\"a ,b\", [1], [2]]\n", make_expected_array_inline_nested_after_comma_string},
     {"array_inline_nested", "[[\"I feel happy!\", \"yay.\"], [\"And there was much rejoicing.\", \"yay.\"]]\n", make_expected_array_inline_nested},
     {"array_inline_singlequote", "['a', 'b']\n", make_expected_array_inline_singlequote},
     {"array_multiline_named", "complaints:\n- \"I didn't vote for you.\"\n- \"Help, help, I'm being repressed!\"\n", make_expected_array_multiline_named},
@@ -799,7 +804,7 @@ static test_fixture_t test_fixtures[] = {
     {NULL, NULL, NULL}
 };
 
-#define TEST_FIXTURE_COUNT 117
+#define TEST_FIXTURE_COUNT 118
 
 static error_fixture_t error_fixtures[] = {
     {"array_inline_invalid_multiline", "array-inline-invalid-multiline.nay", "[\n  1,\n  2\n]\n", 13, "Unexpected newline in inline array at 1:1 of <array-inline-invalid-multiline.nay>"},
@@ -4,9 +4,18 @@ YAY - Yet Another YAML
 A Python parser and serializer for the YAY data format.
 """
 
-from .parser import load, loads
-from .dumper import dump, dumps
+from .parser import compile_loader, load, loads
+from .dumper import compile_schema, dump, dumps
 from .errors import YayError, YaySyntaxError
 
-__all__ = ["load", "loads", "dump", "dumps", "YayError", "YaySyntaxError"]
+__all__ = [
+    "load",
+    "loads",
+    "compile_loader",
+    "dump",
+    "dumps",
+    "compile_schema",
+    "YayError",
+    "YaySyntaxError",
+]
 __version__ = "1.0.0"
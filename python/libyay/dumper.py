@@ -2,53 +2,66 @@
 YAY dumper - serializes Python objects to YAY format.
 """
 
-import math
 import re
-from typing import Any, TextIO
+from functools import lru_cache
+from typing import Any, Callable, Iterable, TextIO
 
+# Unquoted keys start with a letter or underscore and continue with letters,
+# digits, or underscores. ASCII keys are checked in one match; other keys use
+# the Unicode notions of letter and digit.
+_ASCII_KEY_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_KEY_CHARS_RE = re.compile(r"\w+")
 
+# Characters that force a string into double quotes (control chars and backslash).
+_NEEDS_DOUBLE_QUOTE_RE = re.compile(r"[\x00-\x1f\\]")
+_NEEDS_DOUBLE_QUOTE_CHARS = frozenset(map(chr, range(0x20))) | {"\\"}
+_NEEDS_DOUBLE_QUOTE_BYTES = bytes(range(0x20)) + b"\\"
+
+# Translation table for double-quoted output.
+_DOUBLE_QUOTE_ESCAPES = str.maketrans(
+    {
+        **{chr(cp): f"\\u{cp:04x}" for cp in range(0x20)},
+        '"': '\\"',
+        "\\": "\\\\",
+        "\n": "\\n",
+        "\r": "\\r",
+        "\t": "\\t",
+        "\b": "\\b",
+        "\f": "\\f",
+    }
+)
+
+_INFINITY = float("inf")
+
+# Preformatted empty and single-byte arrays.
+_SHORT_BYTES = {b"": "<>", **{bytes([i]): f"<{i:02x}>" for i in range(256)}}
+
+# Indentation prefixes by level, extended on demand.
+_PREFIX_CACHE: list[str] = [""]
+
+
+@lru_cache(maxsize=4096)
 def _is_simple_key(key: str) -> bool:
     """Check if a key can be written without quotes."""
-    if not key:
-        return False
+    if key.isascii():
+        return _ASCII_KEY_RE.fullmatch(key) is not None
     if not (key[0].isalpha() or key[0] == "_"):
         return False
-    return all(c.isalnum() or c == "_" for c in key)
+    return _KEY_CHARS_RE.fullmatch(key) is not None
 
 
 def _needs_double_quote(s: str) -> bool:
     """Check if string needs double quotes (has escapes)."""
-    for ch in s:
-        if ch in "\n\r\t\b\f\\":
-            return True
-        if ord(ch) < 0x20:
-            return True
-    return False
-
-
-def _escape_double_quoted(s: str) -> str:
-    """Escape a string for double-quoted output."""
-    result = []
-    for ch in s:
-        if ch == '"':
-            result.append('\\"')
-        elif ch == "\\":
-            result.append("\\\\")
-        elif ch == "\n":
-            result.append("\\n")
-        elif ch == "\r":
-            result.append("\\r")
-        elif ch == "\t":
-            result.append("\\t")
-        elif ch == "\b":
-            result.append("\\b")
-        elif ch == "\f":
-            result.append("\\f")
-        elif ord(ch) < 0x20:
-            result.append(f"\\u{ord(ch):04x}")
-        else:
-            result.append(ch)
-    return "".join(result)
+    # Iterating an ASCII string yields cached one-character strings, so the
+    # set test wins there; for wider text the regex avoids those allocations.
+    if s.isascii():
+        if len(s) < 32:
+            return not _NEEDS_DOUBLE_QUOTE_CHARS.isdisjoint(s)
+        # Longer ASCII strings: delete the flagged bytes in one C pass and
+        # check whether anything was removed.
+        stripped = s.encode("ascii").translate(None, _NEEDS_DOUBLE_QUOTE_BYTES)
+        return len(stripped) != len(s)
+    return _NEEDS_DOUBLE_QUOTE_RE.search(s) is not None
 
 
 def _escape_single_quoted(s: str) -> str:
@@ -56,101 +69,209 @@ def _escape_single_quoted(s: str) -> str:
     return s.replace("'", "''")
 
 
+def _format_key(key: str) -> str:
+    """Format an object key, quoting it only if necessary."""
+    return key if _is_simple_key(key) else f"'{_escape_single_quoted(key)}'"
+
+
+def _get_prefix(indent: int) -> str:
+    """Return the whitespace prefix for an indentation level."""
+    while len(_PREFIX_CACHE) <= indent:
+        _PREFIX_CACHE.append(_PREFIX_CACHE[-1] + "  ")
+    return _PREFIX_CACHE[indent]
+
+
+def _format_none(value: None, indent: int, inline: bool) -> str:
+    """Format null."""
+    return "null"
+
+
+def _format_bool(value: bool, indent: int, inline: bool) -> str:
+    """Format a boolean."""
+    return "true" if value else "false"
+
+
+def _format_int(value: int, indent: int, inline: bool) -> str:
+    """Format a big integer."""
+    return str(value)
+
+
+def _format_float(value: float, indent: int, inline: bool) -> str:
+    """Format a float64, keeping a decimal point or exponent."""
+    # NaN is the only value unequal to itself
+    if value != value:
+        return "nan"
+    if value == _INFINITY:
+        return "infinity"
+    if value == -_INFINITY:
+        return "-infinity"
+    # float's own repr always keeps a decimal point or an exponent for
+    # finite values (100.0, 1e+16), preserving the distinction from int.
+    return float.__repr__(value)
+
+
+def _format_str(value: str, indent: int, inline: bool) -> str:
+    """Format a quoted string."""
+    if _needs_double_quote(value):
+        return f'"{value.translate(_DOUBLE_QUOTE_ESCAPES)}"'
+    # Prefer single quotes for simple strings
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return f"'{_escape_single_quoted(value)}'"
+
+
+def _format_bytes(value: bytes, indent: int, inline: bool) -> str:
+    """Format an inline byte array."""
+    if len(value) <= 1:
+        return _SHORT_BYTES[value]
+    return f"<{value.hex()}>"
+
+
+def _format_list(value: list, indent: int, inline: bool) -> str:
+    """Format an array."""
+    if inline or not value:
+        # Inline array
+        items = [_format_value(item, 0, inline=True) for item in value]
+        return "[" + ", ".join(items) + "]"
+    parts: list[str] = []
+    _emit_block(value, indent, parts.append, "")
+    return "".join(parts)
+
+
+def _format_dict(value: dict, indent: int, inline: bool) -> str:
+    """Format an object."""
+    if inline or not value:
+        # Inline object
+        items = [
+            f"{_format_key(k)}: {_format_value(v, 0, inline=True)}"
+            for k, v in value.items()
+        ]
+        return "{" + ", ".join(items) + "}"
+    parts: list[str] = []
+    _emit_block(value, indent, parts.append, "")
+    return "".join(parts)
+
+
+# Formatters keyed by exact type. bool is listed on its own because
+# dispatch is on type(value), not isinstance, and bool subclasses int.
+_FORMATTERS: dict[type, Callable[[Any, int, bool], str]] = {
+    type(None): _format_none,
+    bool: _format_bool,
+    int: _format_int,
+    float: _format_float,
+    str: _format_str,
+    bytes: _format_bytes,
+    list: _format_list,
+    dict: _format_dict,
+}
+
+
+def _formatter_for(value: Any) -> Callable[[Any, int, bool], str]:
+    """Find the formatter for an instance of a subclass of a supported type."""
+    for cls in (bool, int, float, str, bytes, list, dict):
+        if isinstance(value, cls):
+            return _FORMATTERS[cls]
+    raise TypeError(f"Cannot serialize type {type(value).__name__} to YAY")
+
+
 def _format_value(value: Any, indent: int = 0, inline: bool = False) -> str:
     """Format a value as YAY."""
-    prefix = "  " * indent
-
+    # Common leaves first: singletons by identity, then exact str and int
     if value is None:
         return "null"
-
-    if isinstance(value, bool):
-        return "true" if value else "false"
-
-    if isinstance(value, int):
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    cls = type(value)
+    if cls is str:
+        return _format_str(value, indent, inline)
+    if cls is int:
         return str(value)
+    formatter = _FORMATTERS.get(cls) or _formatter_for(value)
+    return formatter(value, indent, inline)
 
-    if isinstance(value, float):
-        if math.isnan(value):
-            return "nan"
-        if math.isinf(value):
-            return "-infinity" if value < 0 else "infinity"
-        # Format float to preserve distinction from int
-        s = repr(value)
-        # Ensure there's a decimal point
-        if "." not in s and "e" not in s and "E" not in s:
-            s += ".0"
-        return s
-
-    if isinstance(value, str):
-        if _needs_double_quote(value):
-            return f'"{_escape_double_quoted(value)}"'
-        else:
-            # Prefer single quotes for simple strings
-            if "'" in value and '"' not in value:
-                return f'"{value}"'
-            return f"'{_escape_single_quoted(value)}'"
 
-    if isinstance(value, bytes):
-        return f"<{value.hex()}>"
+def _emit_block(
+    value: list | dict, indent: int, write: Callable[[str], Any], newline: str = "\n"
+) -> None:
+    """
+    Write the block format of a non-empty list or dict.
+
+    Each line is written preceded by a newline; pass newline="" when the
+    block starts the output. Nested blocks are written in place at their
+    final indentation, so no output is ever built and then split to be
+    re-indented.
+    """
+    prefix = _get_prefix(indent)
 
     if isinstance(value, list):
-        if inline or not value:
-            # Inline array
-            items = [_format_value(item, 0, inline=True) for item in value]
-            return "[" + ", ".join(items) + "]"
-        else:
-            # Block array
-            lines = []
-            for item in value:
-                if isinstance(item, (dict, list)) and item:
-                    # Complex nested item
-                    item_str = _format_value(item, indent + 1, inline=False)
-                    if isinstance(item, list):
-                        # Nested list - format inline or as nested block
-                        lines.append(f"{prefix}- {_format_value(item, 0, inline=True)}")
-                    else:
-                        # Nested object
-                        lines.append(f"{prefix}-")
-                        for line in item_str.split("\n"):
-                            if line.strip():
-                                lines.append(f"{prefix}  {line}")
-                else:
-                    item_str = _format_value(item, 0, inline=True)
-                    lines.append(f"{prefix}- {item_str}")
-            return "\n".join(lines)
-
-    if isinstance(value, dict):
-        if inline or not value:
-            # Inline object
-            items = []
-            for k, v in value.items():
-                key_str = k if _is_simple_key(k) else f"'{_escape_single_quoted(k)}'"
-                val_str = _format_value(v, 0, inline=True)
-                items.append(f"{key_str}: {val_str}")
-            return "{" + ", ".join(items) + "}"
+        for item in value:
+            if isinstance(item, dict) and item:
+                # Nested object, indented beneath the dash
+                write(f"{newline}{prefix}-")
+                _emit_block(item, indent + 2, write)
+            else:
+                # Scalars and nested lists are written inline
+                write(f"{newline}{prefix}- {_format_value(item, 0, inline=True)}")
+            newline = "\n"
+        return
+
+    for k, v in value.items():
+        key_str = _format_key(k)
+
+        if isinstance(v, (dict, list)) and v:
+            # Nested object or array
+            write(f"{newline}{prefix}{key_str}:")
+            _emit_block(v, indent + 1, write)
         else:
-            # Block object
-            lines = []
-            for k, v in value.items():
-                key_str = k if _is_simple_key(k) else f"'{_escape_single_quoted(k)}'"
-
-                if isinstance(v, dict) and v:
-                    # Nested object
-                    lines.append(f"{prefix}{key_str}:")
-                    nested = _format_value(v, indent + 1, inline=False)
-                    lines.append(nested)
-                elif isinstance(v, list) and v:
-                    # Nested array
-                    lines.append(f"{prefix}{key_str}:")
-                    nested = _format_value(v, indent + 1, inline=False)
-                    lines.append(nested)
-                else:
-                    # Inline value
-                    val_str = _format_value(v, 0, inline=True)
-                    lines.append(f"{prefix}{key_str}: {val_str}")
-            return "\n".join(lines)
+            # Inline value
+            val_str = _format_value(v, 0, inline=True)
+            write(f"{newline}{prefix}{key_str}: {val_str}")
+        newline = "\n"
 
-    raise TypeError(f"Cannot serialize type {type(value).__name__} to YAY")
+
+@lru_cache(maxsize=256)
+def _compile_schema(keys: tuple[str, ...]) -> Callable[[dict], str]:
+    """Generate and compile the serializer for one key sequence."""
+    if not keys:
+        return lambda obj: "{}"
+    source = ["def serialize(obj):", "    parts = []", "    write = parts.append"]
+    for i, key in enumerate(keys):
+        head = ("\n" if i else "") + _format_key(key) + ":"
+        source += [
+            f"    value = obj[{key!r}]",
+            "    if isinstance(value, (dict, list)) and value:",
+            f"        write({head!r})",
+            "        _emit_block(value, 1, write)",
+            "    else:",
+            f"        write({head + ' '!r} + _format_value(value, 0, True))",
+        ]
+    source.append('    return "".join(parts)')
+    namespace = {"_emit_block": _emit_block, "_format_value": _format_value}
+    exec(compile("\n".join(source), "<yay schema>", "exec"), namespace)
+    return namespace["serialize"]
+
+
+def compile_schema(keys: Iterable[str]) -> Callable[[dict], str]:
+    """
+    Compile a serializer specialized for objects with a fixed set of keys.
+
+    The returned function writes the given keys of a dict, in the given
+    order, exactly as dumps() would write a dict holding those entries.
+    Key quoting and per-entry dispatch are resolved once at compile time,
+    which pays off when serializing many records of the same shape.
+    Compiled serializers are cached by key sequence.
+
+    Args:
+        keys: The object keys, in output order
+
+    Returns:
+        A function serializing one dict to a YAY string
+    """
+    return _compile_schema(tuple(keys))
 
 
 def dumps(obj: Any, *, indent: bool = True) -> str:
@@ -177,4 +298,8 @@ def dump(obj: Any, fp: TextIO, *, indent: bool = True) -> None:
         fp: File-like object to write to
         indent: If True (default), use block format for arrays/objects.
     """
-    fp.write(dumps(obj, indent=indent))
+    if indent and isinstance(obj, (list, dict)) and obj:
+        # Stream block output straight to the file
+        _emit_block(obj, 0, fp.write, "")
+    else:
+        fp.write(_format_value(obj, 0, inline=not indent))
@@ -3,22 +3,162 @@ YAY lexer - tokenizes YAY input.
 """
 
 import re
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
 from typing import Iterator
 from .errors import YaySyntaxError
 
-
-@dataclass
+# Token kinds.  The scalar value kinds come first so that they can be tested
+# with a single comparison.
+K_NULL = 0
+K_BOOL = 1
+K_INT = 2
+K_FLOAT = 3
+K_STRING = 4
+K_BYTES = 5
+K_IDENT = 6
+K_COLON = 7
+K_COMMA = 8
+K_LBRACKET = 9
+K_RBRACKET = 10
+K_LBRACE = 11
+K_RBRACE = 12
+K_DASH = 13
+K_INDENT = 14
+K_NEWLINE = 15
+K_EOF = 16
+
+KIND_NAMES = (
+    "NULL",
+    "BOOL",
+    "INT",
+    "FLOAT",
+    "STRING",
+    "BYTES",
+    "IDENT",
+    "COLON",
+    "COMMA",
+    "LBRACKET",
+    "RBRACKET",
+    "LBRACE",
+    "RBRACE",
+    "DASH",
+    "INDENT",
+    "NEWLINE",
+    "EOF",
+)
+
+# Leading characters recorded on block string and block byte array tokens.
+LEAD_BACKTICK = ord("`")
+LEAD_GT = ord(">")
+
+# Any code point outside the allowed set (see Lexer._is_allowed_code_point):
+# newline, printable ASCII, and the rest of Unicode minus C1 controls,
+# surrogates, and noncharacters.
+_FORBIDDEN_CODE_POINT_RE = re.compile(
+    "[^\\n\\x20-\\x7e\\xa0-\\ud7ff\\ue000-\\ufdcf\\ufdf0-\\ufffd"
+    + "".join(f"\\U{plane:04x}0000-\\U{plane:04x}fffd" for plane in range(1, 17))
+    + "]"
+)
+
+# A line feed; the position after each one starts a new line.
+_NEWLINE_RE = re.compile("\n")
+
+# Runs of quoted string content that need no escape or error handling.
+_DOUBLE_QUOTED_RUN_RE = re.compile(r'[^"\\\x00-\x1f]+')
+_SINGLE_QUOTED_RUN_RE = re.compile(r"[^'\x00-\x1f]+")
+
+# A run of spaces.
+_SPACES_RE = re.compile(" *")
+
+# One line of a block string: its indent, its content, and the line feed.
+_BLOCK_LINE_RE = re.compile("( *)([^\n]*)\n?")
+
+# ASCII character classes for the number and identifier scanners.  Non-ASCII
+# characters fall back to the equivalent str predicate.
+_DIGITS = frozenset("0123456789")
+_NUMBER_START = _DIGITS | {"."}
+_IDENTIFIER_START = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_")
+
+# The rest of an identifier; \w matches exactly the characters for which
+# str.isalnum() is true, plus "_".
+_IDENTIFIER_RE = re.compile(r"[\w-]*")
+
+# Token kinds and values for keywords.
+_KEYWORD_TOKENS = {
+    "null": (K_NULL, None),
+    "true": (K_BOOL, True),
+    "false": (K_BOOL, False),
+    "infinity": (K_FLOAT, float("inf")),
+    "nan": (K_FLOAT, float("nan")),
+}
+
+# Hex digits in byte arrays; uppercase digits are rejected with their own error.
+_HEX_DIGITS = frozenset("0123456789abcdef")
+_UPPER_HEX_DIGITS = frozenset("ABCDEF")
+_HEX_RUN_RE = re.compile("[0-9a-f ]+")
+
+# Single-character punctuation tokens.
+_PUNCTUATION = {
+    ":": K_COLON,
+    ",": K_COMMA,
+    "[": K_LBRACKET,
+    "]": K_RBRACKET,
+    "{": K_LBRACE,
+    "}": K_RBRACE,
+}
+
+# Spaces followed by punctuation or a comment.
+_SCANNER_RE = re.compile(r" *(?:([:,\[\]{}]) *|#[^\n]*)?")
+_SCANNER_START = frozenset(" #").union(_PUNCTUATION)
+
+
+@dataclass(slots=True)
 class Token:
     """A token from the YAY lexer."""
 
-    kind: str
+    kind: int
     value: object
     line: int
     col: int
+    # Code point of the block leader (LEAD_BACKTICK or LEAD_GT), else 0
+    lead_char: int = 0
 
     def __repr__(self) -> str:
-        return f"Token({self.kind!r}, {self.value!r}, line={self.line}, col={self.col})"
+        kind = KIND_NAMES[self.kind]
+        lead = f", lead_char={chr(self.lead_char)!r}" if self.lead_char else ""
+        return (
+            f"Token({kind!r}, {self.value!r}, line={self.line}, col={self.col}{lead})"
+        )
+
+
+class TokenColumns:
+    """
+    Tokens stored as parallel sequences of kinds, values, lines, columns and
+    block leaders.
+    """
+
+    __slots__ = ("kinds", "values", "lines", "cols", "lead_chars")
+
+    def __init__(self) -> None:
+        self.kinds = array("B")
+        self.values: list[object] = []
+        self.lines = array("q")
+        self.cols = array("q")
+        self.lead_chars = array("I")
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        return Token(
+            self.kinds[index],
+            self.values[index],
+            self.lines[index],
+            self.cols[index],
+            self.lead_chars[index],
+        )
 
 
 class Lexer:
@@ -34,15 +174,24 @@ class Lexer:
 
     KEYWORDS = {"null", "true", "false", "infinity", "nan"}
 
+    current_line_indent: int = 0
+
     def __init__(self, source: str):
         self.source = source
         self.pos = 0
         self.line = 1
-        self.col = 1
+        # Offset of the first character of each line, for locating positions
+        self._line_starts = [0]
+        self._line_starts.extend(m.end() for m in _NEWLINE_RE.finditer(source))
+        self._line_start = 0  # Offset of the current line
         self.indent_stack = [0]
         self.at_line_start = True
         self.pending_tokens: list[Token] = []
         self.current_line_indent = 0  # Track indent of current line
+        self._last_token: Token | None = None
+        # When set, tokenize records (pos, current_line_indent, last token,
+        # token count) each time it reaches the start of a line
+        self.line_checkpoints: list[tuple[int, int, Token | None, int]] | None = None
 
         # Validate source upfront
         self._validate_source()
@@ -69,63 +218,82 @@ class Lexer:
                 raise YaySyntaxError("Illegal BOM", 1, 1)
 
         # Check for forbidden code points
-        line = 1
-        col = 1
-        for ch in self.source:
-            cp = ord(ch)
-            if not self._is_allowed_code_point(cp):
-                if cp == 0x09:
-                    raise YaySyntaxError("Tab not allowed (use spaces)", line, col)
-                if 0xD800 <= cp <= 0xDFFF:
-                    raise YaySyntaxError("Illegal surrogate", line, col)
-                raise YaySyntaxError(f"Forbidden code point U+{cp:04X}", line, col)
-            if cp == 0x0A:
-                line += 1
-                col = 1
-            else:
-                col += 1
-
-        # Check for trailing spaces line by line
-        lines = self.source.split("\n")
-        for i, line_str in enumerate(lines):
-            line_num = i + 1
-            # Check for trailing space (but not on the last empty line)
-            if line_str.endswith(" ") and not (i == len(lines) - 1 and line_str == ""):
-                raise YaySyntaxError(
-                    "Unexpected trailing space", line_num, len(line_str)
-                )
+        m = _FORBIDDEN_CODE_POINT_RE.search(self.source)
+        if m is not None:
+            line, col = self._locate(m.start())
+            cp = ord(m.group())
+            if cp == 0x09:
+                raise YaySyntaxError("Tab not allowed (use spaces)", line, col)
+            if 0xD800 <= cp <= 0xDFFF:
+                raise YaySyntaxError("Illegal surrogate", line, col)
+            raise YaySyntaxError(f"Forbidden code point U+{cp:04X}", line, col)
+
+        # Check for trailing spaces
+        pos = self.source.find(" \n")
+        if pos == -1 and self.source.endswith(" "):
+            pos = len(self.source) - 1
+        if pos != -1:
+            line, col = self._locate(pos)
+            raise YaySyntaxError("Unexpected trailing space", line, col)
+
+    def _locate(self, pos: int) -> tuple[int, int]:
+        """Return the 1-based line and column of a source offset."""
+        line_starts = self._line_starts
+        line = bisect_right(line_starts, pos)
+        return line, pos - line_starts[line - 1] + 1
+
+    @property
+    def col(self) -> int:
+        """The 1-based column of the current position."""
+        return self.pos - self._line_start + 1
 
     def peek(self, offset: int = 0) -> str:
         """Peek at character at current position + offset."""
-        idx = self.pos + offset
-        if idx >= len(self.source):
+        try:
+            return self.source[self.pos + offset]
+        except IndexError:
             return ""
-        return self.source[idx]
 
     def advance(self, count: int = 1) -> str:
         """Advance position and return consumed characters."""
-        result = self.source[self.pos : self.pos + count]
-        for ch in result:
-            if ch == "\n":
-                self.line += 1
-                self.col = 1
-                self.at_line_start = True
-            else:
-                self.col += 1
-        self.pos += count
+        pos = self.pos
+        result = self.source[pos : pos + count]
+        self.pos = pos + count
+        if "\n" in result:
+            self.at_line_start = True
+            self.line = bisect_right(self._line_starts, self.pos)
+            self._line_start = self._line_starts[self.line - 1]
         return result
 
+    def _seek(self, pos: int) -> None:
+        """Move to a source offset, possibly on another line."""
+        self.pos = pos
+        self.line = bisect_right(self._line_starts, pos)
+        self._line_start = self._line_starts[self.line - 1]
+
     def skip_to_eol(self) -> None:
         """Skip to end of line (for comments)."""
-        while self.peek() and self.peek() != "\n":
-            self.advance()
+        end = self.source.find("\n", self.pos)
+        if end == -1:
+            end = len(self.source)
+        self.pos = end
+
+    def _read_to_eol(self) -> str:
+        """Consume and return the rest of the current line."""
+        start = self.pos
+        self.skip_to_eol()
+        return self.source[start : self.pos]
+
+    def _skip_spaces(self) -> int:
+        """Consume a run of spaces and return how many there were."""
+        start = self.pos
+        end = _SPACES_RE.match(self.source, start).end()
+        self.pos = end
+        return end - start
 
     def read_indent(self) -> int:
         """Read leading spaces and return indent level."""
-        spaces = 0
-        while self.peek() == " ":
-            self.advance()
-            spaces += 1
+        spaces = self._skip_spaces()
         if self.peek() == "\t":
             raise self.error("Tab not allowed (use spaces)")
         return spaces
@@ -170,46 +338,37 @@ class Lexer:
     ) -> Token:
         """Read block string content after the backtick introducer."""
         lines = []
-        base_indent = (
-            self.current_line_indent if hasattr(self, "current_line_indent") else 0
-        )
+        base_indent = self.current_line_indent
 
         if same_line:
             # First line content is on the same line as the backtick
-            first_line = []
-            while self.peek() and self.peek() != "\n":
-                first_line.append(self.advance())
-            lines.append("".join(first_line))
+            lines.append(self._read_to_eol())
             if self.peek() == "\n":
                 self.advance()
                 self.at_line_start = True
 
-        # Read subsequent lines
-        while self.pos < len(self.source):
-            line_start = self.pos
-            line_start_line = self.line
-            spaces = 0
-            while self.peek() == " ":
-                spaces += 1
-                self.advance()
-
-            # If dedented to base level or less, block ends
-            if spaces <= base_indent and self.peek() not in ("\n", ""):
-                self.pos = line_start
-                self.line = line_start_line
-                self.col = 1
-                self.at_line_start = True
-                break
-
-            # Empty line
-            if self.peek() == "\n":
+        # Read subsequent lines, one regex match per line
+        source = self.source
+        length = len(source)
+        pos = self.pos
+        while pos < length:
+            m = _BLOCK_LINE_RE.match(source, pos)
+            spaces = m.end(1) - pos
+            content = m.group(2)
+
+            if not content:
+                # EOF
+                if m.end(2) == length:
+                    pos = length
+                    break
+                # Empty line
                 lines.append("")
-                self.advance()
-                self.at_line_start = True
+                pos = m.end()
                 continue
 
-            # EOF
-            if self.peek() == "":
+            # If dedented to base level or less, block ends
+            if spaces <= base_indent:
+                self.at_line_start = True
                 break
 
             # Strip base indent + 2 spaces
@@ -219,15 +378,9 @@ class Lexer:
             else:
                 extra_spaces = ""
 
-            # Read line content
-            line_chars = [extra_spaces]
-            while self.peek() and self.peek() != "\n":
-                line_chars.append(self.advance())
-            lines.append("".join(line_chars))
-
-            if self.peek() == "\n":
-                self.advance()
-                self.at_line_start = True
+            lines.append(extra_spaces + content)
+            pos = m.end()
+        self._seek(pos)
 
         # Build result - trim trailing empty lines
         while lines and lines[-1] == "":
@@ -245,7 +398,7 @@ class Lexer:
                     'Empty block string not allowed (use "" or "\\n" explicitly)'
                 )
 
-        return Token("STRING", result, start_line, start_col)
+        return Token(K_STRING, result, start_line, start_col, LEAD_BACKTICK)
 
     def _read_block_bytes(self) -> Token:
         """Read a block byte array starting with >."""
@@ -274,83 +427,37 @@ class Lexer:
                 self.advance()
                 self.at_line_start = True
 
-        base_indent = (
-            self.current_line_indent if hasattr(self, "current_line_indent") else 0
-        )
+        base_indent = self.current_line_indent
         hex_chars = []
 
         # Read first line (after > or > )
-        while self.peek() and self.peek() not in "\n":
-            ch = self.peek()
-            if ch == "#":
-                self.skip_to_eol()
-                break
-            if ch == " ":
-                self.advance()
-                continue
-            if ch in "0123456789abcdef":
-                hex_chars.append(self.advance())
-            elif ch in "ABCDEF":
-                raise YaySyntaxError(
-                    "Uppercase hex digit (use lowercase)", self.line, self.col
-                )
-            else:
-                raise self.error(f"Invalid character in byte array: {ch!r}")
-
-        if self.peek() == "\n":
-            self.advance()
-            self.at_line_start = True
+        self._consume_hex_line(hex_chars)
 
         # Read continuation lines
-        while self.pos < len(self.source):
+        length = len(self.source)
+        while self.pos < length:
             line_start = self.pos
-            line_start_line = self.line
-            spaces = 0
-            while self.peek() == " ":
-                spaces += 1
-                self.advance()
+            spaces = self._skip_spaces()
+            ch = self.peek()
 
             # If dedented, block ends
-            if spaces <= base_indent and self.peek() not in ("\n", ""):
+            if spaces <= base_indent and ch != "\n" and ch != "":
                 self.pos = line_start
-                self.line = line_start_line
-                self.col = 1
                 self.at_line_start = True
                 break
 
             # Empty line ends block
-            if self.peek() == "\n":
+            if ch == "\n":
                 self.pos = line_start
-                self.line = line_start_line
-                self.col = 1
                 self.at_line_start = True
                 break
 
             # EOF
-            if self.peek() == "":
+            if ch == "":
                 break
 
             # Read hex content
-            while self.peek() and self.peek() not in "\n":
-                ch = self.peek()
-                if ch == "#":
-                    self.skip_to_eol()
-                    break
-                if ch == " ":
-                    self.advance()
-                    continue
-                if ch in "0123456789abcdef":
-                    hex_chars.append(self.advance())
-                elif ch in "ABCDEF":
-                    raise YaySyntaxError(
-                        "Uppercase hex digit (use lowercase)", self.line, self.col
-                    )
-                else:
-                    raise self.error(f"Invalid character in byte array: {ch!r}")
-
-            if self.peek() == "\n":
-                self.advance()
-                self.at_line_start = True
+            self._consume_hex_line(hex_chars)
 
         hex_str = "".join(hex_chars)
         if len(hex_str) % 2 != 0:
@@ -361,12 +468,42 @@ class Lexer:
         except ValueError as e:
             raise self.error(f"Invalid hex: {e}")
 
-        return Token("BYTES", value, start_line, start_col)
+        return Token(K_BYTES, value, start_line, start_col, LEAD_GT)
+
+    def _consume_hex_line(self, hex_chars: list[str]) -> None:
+        """Read the hex digits on one line of a block byte array."""
+        while True:
+            ch = self.peek()
+            if ch == "" or ch == "\n":
+                break
+            if ch == "#":
+                self.skip_to_eol()
+                break
+            if ch == " ":
+                self.advance()
+                continue
+            if ch in _HEX_DIGITS:
+                hex_chars.append(self.advance())
+            elif ch in _UPPER_HEX_DIGITS:
+                raise YaySyntaxError(
+                    "Uppercase hex digit (use lowercase)", self.line, self.col
+                )
+            else:
+                raise self.error(f"Invalid character in byte array: {ch!r}")
+
+        if self.peek() == "\n":
+            self.advance()
+            self.at_line_start = True
 
     def _read_double_quoted_string(self, start_line: int, start_col: int) -> Token:
         """Read a JSON-style double-quoted string with escape sequences."""
+        source = self.source
         chars = []
         while True:
+            m = _DOUBLE_QUOTED_RUN_RE.match(source, self.pos)
+            if m is not None:
+                chars.append(m.group())
+                self.pos = m.end()
             ch = self.peek()
             if ch == "":
                 raise self.error("Unterminated string")
@@ -425,20 +562,24 @@ class Lexer:
                 else:
                     raise self.error("Bad escaped character")
                 self.advance()
-            elif ord(ch) < 0x20:
+            else:
                 # Newline means unterminated string, other control chars are bad
                 if ch == "\n" or ch == "\r":
                     raise self.error("Unterminated string")
                 raise self.error("Bad character in string")
-            else:
-                chars.append(self.advance())
 
-        return Token("STRING", "".join(chars), start_line, start_col)
+        return Token(K_STRING, "".join(chars), start_line, start_col)
 
     def _read_single_quoted_string(self, start_line: int, start_col: int) -> Token:
         """Read a single-quoted string (literal, no escape sequences except '')."""
+        source = self.source
         chars = []
         while True:
+            # Single-quoted strings are literal - no backslash escapes
+            m = _SINGLE_QUOTED_RUN_RE.match(source, self.pos)
+            if m is not None:
+                chars.append(m.group())
+                self.pos = m.end()
             ch = self.peek()
             if ch == "":
                 raise self.error("Unterminated string")
@@ -450,16 +591,13 @@ class Lexer:
                     self.advance()
                 else:
                     break
-            elif ord(ch) < 0x20:
+            else:
                 # Newline means unterminated string, other control chars are bad
                 if ch == "\n" or ch == "\r":
                     raise self.error("Unterminated string")
                 raise self.error("Bad character in string")
-            else:
-                # Single-quoted strings are literal - no backslash escapes
-                chars.append(self.advance())
 
-        return Token("STRING", "".join(chars), start_line, start_col)
+        return Token(K_STRING, "".join(chars), start_line, start_col)
 
     def read_number(self) -> Token:
         """Read a number (big integer or float)."""
@@ -481,7 +619,7 @@ class Lexer:
         # Read digits, dots, exponents, and grouping spaces
         while True:
             ch = self.peek()
-            if ch.isdigit():
+            if ch in _DIGITS or (ch >= "\x80" and ch.isdigit()):
                 chars.append(self.advance())
                 last_was_space = False
             elif ch == ".":
@@ -504,7 +642,7 @@ class Lexer:
                 has_exponent = True
                 chars.append(self.advance())
                 # Allow optional +/- after exponent
-                if self.peek() in "+-":
+                if self.peek() in ("+", "-"):
                     chars.append(self.advance())
             elif ch == "E" and not has_exponent and len(chars) > 0:
                 # Uppercase E is not allowed
@@ -514,7 +652,7 @@ class Lexer:
             elif ch == " ":
                 # Space for digit grouping - peek ahead to see if more digits follow
                 next_ch = self.peek(1)
-                if next_ch.isdigit():
+                if next_ch in _DIGITS or (next_ch >= "\x80" and next_ch.isdigit()):
                     space_col = self.col
                     self.advance()  # consume space but don't add to chars
                     last_was_space = True
@@ -535,13 +673,13 @@ class Lexer:
                 value = float(num_str)
             except ValueError:
                 raise self.error(f"Invalid float: {num_str}")
-            return Token("FLOAT", value, start_line, start_col)
+            return Token(K_FLOAT, value, start_line, start_col)
         else:
             try:
                 value = int(num_str)
             except ValueError:
                 raise self.error(f"Invalid integer: {num_str}")
-            return Token("INT", value, start_line, start_col)
+            return Token(K_INT, value, start_line, start_col)
 
     def read_bytes(
         self, already_consumed_open: bool = False, allow_multiline: bool = False
@@ -558,10 +696,20 @@ class Lexer:
         if not already_consumed_open:
             self.advance()  # consume '<'
 
+        source = self.source
         hex_chars = []
         last_was_space = False
         space_col = 0
         while True:
+            # Consume a run of hex digits and grouping spaces in one step
+            m = _HEX_RUN_RE.match(source, self.pos)
+            if m is not None:
+                run = m.group()
+                hex_chars.append(run.replace(" ", ""))
+                self.pos = m.end()
+                last_was_space = run[-1] == " "
+                if last_was_space:
+                    space_col = self.col - 1
             ch = self.peek()
             if ch == "":
                 # End of file - only valid in multiline mode
@@ -576,11 +724,6 @@ class Lexer:
                     )
                 self.advance()
                 break
-            if ch == " ":
-                space_col = self.col
-                last_was_space = True
-                self.advance()
-                continue
             last_was_space = False
             if ch == "\n":
                 if allow_multiline:
@@ -588,17 +731,12 @@ class Lexer:
                     self.advance()
                     self.at_line_start = True
                     # Peek at indent of next line
-                    spaces = 0
-                    pos = self.pos
-                    while pos < len(self.source) and self.source[pos] == " ":
-                        spaces += 1
-                        pos += 1
+                    spaces = _SPACES_RE.match(source, self.pos).end() - self.pos
                     # If dedented or at a non-hex char, end the block
                     if spaces < 2:
                         break
                     # Skip the indent
-                    for _ in range(spaces):
-                        self.advance()
+                    self._skip_spaces()
                     self.at_line_start = False
                     continue
                 else:
@@ -609,17 +747,14 @@ class Lexer:
             if ch == "#":
                 self.skip_to_eol()
                 continue
-            if ch in "0123456789abcdef":
-                hex_chars.append(self.advance())
-            elif ch in "ABCDEF":
+            if ch in _UPPER_HEX_DIGITS:
                 raise YaySyntaxError(
                     "Uppercase hex digit (use lowercase)", self.line, self.col
                 )
-            else:
-                if block_mode:
-                    # Unknown char ends block mode
-                    break
-                raise self.error(f"Invalid character in byte array: {ch!r}")
+            if allow_multiline:
+                # Unknown char ends block mode
+                break
+            raise self.error("Invalid hex digit")
 
         hex_str = "".join(hex_chars)
         if len(hex_str) % 2 != 0:
@@ -630,48 +765,128 @@ class Lexer:
         except ValueError as e:
             raise self.error(f"Invalid hex: {e}")
 
-        return Token("BYTES", value, start_line, start_col)
+        return Token(K_BYTES, value, start_line, start_col)
 
     def read_identifier(self) -> Token:
         """Read an identifier or keyword."""
         start_line = self.line
         start_col = self.col
-        chars = []
+        end = _IDENTIFIER_RE.match(self.source, self.pos).end()
+        name = self.source[self.pos : end]
+        self.pos = end
 
-        while True:
-            ch = self.peek()
-            if ch.isalnum() or ch == "_" or ch == "-":
-                chars.append(self.advance())
-            else:
-                break
+        # Check for keywords
+        keyword = _KEYWORD_TOKENS.get(name)
+        if keyword is not None:
+            return Token(keyword[0], keyword[1], start_line, start_col)
+        return Token(K_IDENT, name, start_line, start_col)
 
-        name = "".join(chars)
+    def _lex_string(self, ch: str) -> Token:
+        """Read a quoted string."""
+        return self.read_string(ch)
 
-        # Check for keywords
-        if name == "null":
-            return Token("NULL", None, start_line, start_col)
-        elif name == "true":
-            return Token("BOOL", True, start_line, start_col)
-        elif name == "false":
-            return Token("BOOL", False, start_line, start_col)
-        elif name == "infinity":
-            return Token("FLOAT", float("inf"), start_line, start_col)
-        elif name == "nan":
-            return Token("FLOAT", float("nan"), start_line, start_col)
-        else:
-            return Token("IDENT", name, start_line, start_col)
+    def _lex_block_string(self, ch: str) -> Token:
+        """Read a backtick block string."""
+        return self._read_backtick_block_string()
 
-    def tokenize(self) -> Iterator[Token]:
-        """Generate tokens from the source."""
-        self._last_token = None
+    def _lex_block_bytes(self, ch: str) -> Token:
+        """Read a block byte array (>)."""
+        return self._read_block_bytes()
 
-        def emit(token):
-            self._last_token = token
+    def _lex_inline_bytes(self, ch: str) -> Token:
+        """Read an inline byte array <hex>."""
+        start_col = self.col
+        self.advance()  # consume '<'
+        next_ch = self.peek()
+        if next_ch == ">":
+            # Empty bytes <>
+            self.advance()
+            return Token(K_BYTES, b"", self.line, self.col - 2)
+        elif next_ch == "\n" or next_ch == "":
+            # Unclosed angle bracket - inline byte arrays must be closed on the same line
+            raise YaySyntaxError("Unmatched angle bracket", self.line, start_col)
+        elif next_ch in "ABCDEF":
+            # Uppercase hex digit - reject with specific error
+            raise YaySyntaxError(
+                "Uppercase hex digit (use lowercase)", self.line, self.col
+            )
+        elif next_ch in " " or next_ch in "0123456789abcdef":
+            # Inline byte array - read until closing >
+            # already_consumed_open=True since we already consumed '<'
+            # allow_multiline=False since inline byte arrays must close on same line
+            return self.read_bytes(already_consumed_open=True, allow_multiline=False)
+        else:
+            raise self.error(f"Invalid character after '<': {next_ch!r}")
+
+    def _lex_number(self, ch: str) -> Token:
+        """Read a number starting with a digit or dot."""
+        return self.read_number()
+
+    def _lex_dash(self, ch: str) -> Token:
+        """Read a negative number, -infinity, or a list item marker."""
+        next_ch = self.peek(1)
+        if next_ch in _NUMBER_START or (next_ch >= "\x80" and next_ch.isdigit()):
+            return self.read_number()
+        elif next_ch == "i":
+            # Could be -infinity
+            self.advance()  # consume '-'
+            tok = self.read_identifier()
+            if tok.kind == K_FLOAT and tok.value == float("inf"):
+                return Token(K_FLOAT, float("-inf"), tok.line, tok.col - 1)
+            else:
+                raise self.error(f"Unexpected: -{tok.value}")
+        else:
+            # List item marker
+            token = Token(K_DASH, "-", self.line, self.col)
+            self.advance()
             return token
 
-        while self.pos < len(self.source):
+    def _lex_identifier(self, ch: str) -> Token:
+        """Read an identifier or keyword."""
+        return self.read_identifier()
+
+    # Token readers keyed by the first character of the token
+    _DISPATCH = {
+        '"': _lex_string,
+        "'": _lex_string,
+        "`": _lex_block_string,
+        ">": _lex_block_bytes,
+        "<": _lex_inline_bytes,
+        "-": _lex_dash,
+        **dict.fromkeys(_NUMBER_START, _lex_number),
+        **dict.fromkeys(_IDENTIFIER_START, _lex_identifier),
+    }
+
+    def tokenize(self) -> Iterator[Token]:
+        """Generate tokens from the source."""
+        yield from self.tokenize_list()
+
+    def tokenize_list(self) -> list[Token]:
+        """Tokenize the source into a list."""
+        tokens: list[Token] = []
+        self.tokenize_into(tokens)
+        return tokens
+
+    def tokenize_into(self, tokens: list[Token]) -> None:
+        """Tokenize the source, appending to a caller-supplied list."""
+        start = len(tokens)
+        append = tokens.append
+
+        source = self.source
+        length = len(source)
+        checkpoints = self.line_checkpoints
+        while self.pos < length:
             # Handle line start (indentation)
             if self.at_line_start:
+                if checkpoints is not None:
+                    checkpoints.append(
+                        (
+                            self.pos,
+                            self.current_line_indent,
+                            tokens[-1] if len(tokens) > start else self._last_token,
+                            len(tokens),
+                        )
+                    )
                 self.at_line_start = False
                 indent = self.read_indent()
 
@@ -692,148 +907,150 @@ class Lexer:
 
                 # Emit indent/dedent tokens
                 self.current_line_indent = indent
-                yield emit(Token("INDENT", indent, self.line, 1))
+                append(Token(K_INDENT, indent, self.line, 1))
 
             ch = self.peek()
 
+            # Skip spaces and a comment, or read punctuation, in one match
+            if ch in _SCANNER_START:
+                m = _SCANNER_RE.match(source, self.pos)
+                punctuation = m.group(1)
+                if punctuation is not None:
+                    col = m.start(1) - self._line_start + 1
+                    append(
+                        Token(_PUNCTUATION[punctuation], punctuation, self.line, col)
+                    )
+                    self.pos = m.end()
+                    continue
+                self.pos = m.end()
+                ch = self.peek()
+
             if ch == "":
                 break
 
             if ch == "\n":
-                yield emit(Token("NEWLINE", "\n", self.line, self.col))
+                append(Token(K_NEWLINE, "\n", self.line, self.col))
                 self.advance()
                 self.at_line_start = True
                 continue
 
-            if ch == " ":
-                self.advance()
-                continue
-
-            if ch == "#":
-                self.skip_to_eol()
-                continue
-
             if ch == "\t":
                 raise self.error("Tab not allowed (use spaces)")
 
-            # String
-            if ch in "\"'":
-                yield emit(self.read_string(ch))
-                continue
-
-            # Block string (backtick)
-            if ch == "`":
-                yield emit(self._read_backtick_block_string())
-                continue
-
-            # Block byte array (>)
-            if ch == ">":
-                yield emit(self._read_block_bytes())
+            handler = self._DISPATCH.get(ch)
+            if handler is not None:
+                append(handler(self, ch))
                 continue
 
-            # Bytes - inline byte array <hex>
-            if ch == "<":
-                start_col = self.col
-                self.advance()  # consume '<'
-                next_ch = self.peek()
-                if next_ch == ">":
-                    # Empty bytes <>
-                    self.advance()
-                    yield emit(Token("BYTES", b"", self.line, self.col - 2))
+            # Non-ASCII digits and letters
+            if ch >= "\x80":
+                if ch.isdigit():
+                    append(self.read_number())
                     continue
-                elif next_ch == "\n" or next_ch == "":
-                    # Unclosed angle bracket - inline byte arrays must be closed on the same line
-                    raise YaySyntaxError(
-                        "Unmatched angle bracket", self.line, start_col
-                    )
-                elif next_ch in "ABCDEF":
-                    # Uppercase hex digit - reject with specific error
-                    raise YaySyntaxError(
-                        "Uppercase hex digit (use lowercase)", self.line, self.col
-                    )
-                elif next_ch in " " or next_ch in "0123456789abcdef":
-                    # Inline byte array - read until closing >
-                    # already_consumed_open=True since we already consumed '<'
-                    # allow_multiline=False since inline byte arrays must close on same line
-                    yield emit(
-                        self.read_bytes(
-                            already_consumed_open=True, allow_multiline=False
-                        )
-                    )
+                if ch.isalpha():
+                    append(self.read_identifier())
                     continue
-                else:
-                    raise self.error(f"Invalid character after '<': {next_ch!r}")
-
-            # Number (starts with digit, dot, or minus followed by digit/dot)
-            if ch.isdigit() or ch == ".":
-                yield emit(self.read_number())
-                continue
-
-            if ch == "-":
-                next_ch = self.peek(1)
-                if next_ch.isdigit() or next_ch == ".":
-                    yield emit(self.read_number())
-                    continue
-                elif next_ch == "i":
-                    # Could be -infinity
-                    self.advance()  # consume '-'
-                    tok = self.read_identifier()
-                    if tok.kind == "FLOAT" and tok.value == float("inf"):
-                        yield emit(Token("FLOAT", float("-inf"), tok.line, tok.col - 1))
-                        continue
-                    else:
-                        raise self.error(f"Unexpected: -{tok.value}")
-                else:
-                    # List item marker
-                    yield emit(Token("DASH", "-", self.line, self.col))
-                    self.advance()
-                    continue
-
-            # Punctuation
-            if ch == ":":
-                yield emit(Token("COLON", ":", self.line, self.col))
-                self.advance()
-                continue
-
-            if ch == ",":
-                yield emit(Token("COMMA", ",", self.line, self.col))
-                self.advance()
-                continue
-
-            if ch == "[":
-                yield emit(Token("LBRACKET", "[", self.line, self.col))
-                self.advance()
-                continue
-
-            if ch == "]":
-                yield emit(Token("RBRACKET", "]", self.line, self.col))
-                self.advance()
-                continue
-
-            if ch == "{":
-                yield emit(Token("LBRACE", "{", self.line, self.col))
-                self.advance()
-                continue
-
-            if ch == "}":
-                yield emit(Token("RBRACE", "}", self.line, self.col))
-                self.advance()
-                continue
-
-            # Identifier or keyword
-            if ch.isalpha() or ch == "_":
-                yield emit(self.read_identifier())
-                continue
 
             # Check if we're in a context where this might be an invalid key
             # (after { or , in an inline object)
-            if self._last_token and self._last_token.kind in ("LBRACE", "COMMA"):
+            last_token = tokens[-1] if len(tokens) > start else self._last_token
+            if last_token and last_token.kind in (K_LBRACE, K_COMMA):
                 raise self.error("Invalid key")
 
             raise self.error(f'Unexpected character "{ch}"')
 
         # Final newline token if needed
         if not self.at_line_start:
-            yield emit(Token("NEWLINE", "\n", self.line, self.col))
+            append(Token(K_NEWLINE, "\n", self.line, self.col))
+
+        append(Token(K_EOF, None, self.line, self.col))
+        self._last_token = tokens[-1]
+
+    def resume_at(
+        self, pos: int, current_line_indent: int, last_token: Token | None
+    ) -> None:
+        """Continue lexing from a line start recorded in line_checkpoints."""
+        self._seek(pos)
+        self.at_line_start = True
+        self.current_line_indent = current_line_indent
+        self._last_token = last_token
+
+    def tokenize_columns(self) -> TokenColumns:
+        """Tokenize the source into parallel sequences."""
+        columns = TokenColumns()
+        add_kind = columns.kinds.append
+        add_value = columns.values.append
+        add_line = columns.lines.append
+        add_col = columns.cols.append
+        add_lead_char = columns.lead_chars.append
+        for token in self.tokenize_list():
+            add_kind(token.kind)
+            add_value(token.value)
+            add_line(token.line)
+            add_col(token.col)
+            add_lead_char(token.lead_char)
+        return columns
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Return the length of the longest common prefix of two strings."""
+    lo = 0
+    hi = min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class IncrementalLexer:
+    """
+    Re-tokenizes successive versions of a document.
+
+    Tokens before the line preceding the first edit are reused from the
+    previous run; lexing resumes from the start of a line recorded there.
+    """
 
-        yield emit(Token("EOF", None, self.line, self.col))
+    def __init__(self) -> None:
+        self.last_source = ""
+        self.tokens: list[Token] = []
+        # Line checkpoints of the last run, with the number of tokens
+        # emitted before each one
+        self.checkpoints: list[tuple[int, int, Token | None]] = []
+        self.token_counts: list[int] = []
+
+    def tokenize(self, source: str) -> list[Token]:
+        """Tokenize source, reusing tokens from the previous source."""
+        lexer = Lexer(source)
+        lexer.line_checkpoints = []
+        tokens: list[Token] = []
+        checkpoints: list[tuple[int, int, Token | None]] = []
+        token_counts: list[int] = []
+
+        # Everything before a checkpoint was decided by characters before
+        # the first non-space character of the checkpoint's line, so any
+        # checkpoint on a line before the edited one is safe to resume from.
+        diff = _common_prefix_length(self.last_source, source)
+        edited_line_start = source.rfind("\n", 0, diff) + 1
+        positions = [checkpoint[0] for checkpoint in self.checkpoints]
+        index = bisect_right(positions, edited_line_start - 1) - 1
+        if index >= 0:
+            count = self.token_counts[index]
+            tokens.extend(self.tokens[:count])
+            checkpoints.extend(self.checkpoints[:index])
+            token_counts.extend(self.token_counts[:index])
+            lexer.resume_at(*self.checkpoints[index])
+
+        offset = len(tokens)
+        tokens.extend(lexer.tokenize_list())
+        for pos, indent, last_token, count in lexer.line_checkpoints:
+            checkpoints.append((pos, indent, last_token))
+            token_counts.append(offset + count)
+
+        self.last_source = source
+        self.tokens = tokens
+        self.checkpoints = checkpoints
+        self.token_counts = token_counts
+        return tokens
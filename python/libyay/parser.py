@@ -2,12 +2,120 @@
 YAY parser - parses YAY input into Python objects.
 """
 
-import math
-from typing import Any, TextIO
-from .lexer import Lexer, Token
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterable, TextIO
+from .lexer import (
+    K_FLOAT,
+    K_STRING,
+    K_BYTES,
+    K_IDENT,
+    K_COLON,
+    K_COMMA,
+    K_LBRACKET,
+    K_RBRACKET,
+    K_LBRACE,
+    K_RBRACE,
+    K_DASH,
+    K_INDENT,
+    K_NEWLINE,
+    K_EOF,
+    KIND_NAMES,
+    LEAD_BACKTICK,
+    LEAD_GT,
+    Lexer,
+    Token,
+)
 from .errors import YaySyntaxError
 
 
+# Classes of the spacing that follows a ":" or "-" on its line
+_SPACE_OK = 0
+_SPACE_MISSING = 1
+_SPACE_DOUBLE = 2
+
+
+# Characters outside strings that the inline syntax checks react to, by the
+# opening bracket of the inline form
+_INLINE_SPECIAL = {
+    "[": frozenset("'\"[],"),
+    "{": frozenset("'\"{},"),
+}
+
+# Spacing that could be an inline syntax error, ignoring strings.  A line
+# without any of these cannot fail the check.
+_INLINE_SUSPECT = {
+    "[": re.compile(r"\[ | \]| ,|,(?:[^ \]]|  )"),
+    "{": re.compile(r"\{ | \}| ,|,(?:[^ }]|  )"),
+}
+
+
+def _comma_closings(
+    s: str, start: int, end: int, open_char: str, close_char: str
+) -> dict[int, bool]:
+    """Map each comma in s[start:end] to whether the next closing bracket at its
+    depth, if reached before another comma at that depth, has a space before
+    it.
+
+    Uses the same quote, escape, and depth tracking as
+    Parser.validate_inline_syntax, in a single pass.
+    """
+    result: dict[int, bool] = {}
+    pending: dict[int, list[int]] = {}
+    special = _INLINE_SPECIAL[open_char]
+    in_single = False
+    in_double = False
+    escape = False
+    depth = 0
+    for i in range(start, end):
+        ch = s[i]
+        if escape:
+            escape = False
+            continue
+        if in_single:
+            if ch == "\\":
+                escape = True
+            elif ch == "'":
+                in_single = False
+            continue
+        if in_double:
+            if ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_double = False
+            continue
+        if ch not in special:
+            continue
+        if ch == "'":
+            in_single = True
+            continue
+        if ch == '"':
+            in_double = True
+            continue
+        if ch == open_char:
+            depth += 1
+            continue
+        if ch == close_char:
+            waiting = pending.pop(depth, None)
+            if waiting:
+                with_space = s[i - 1] == " "
+                for comma in waiting:
+                    result[comma] = with_space
+            if depth > 0:
+                depth -= 1
+            continue
+        if ch == ",":
+            waiting = pending.get(depth)
+            if waiting:
+                for comma in waiting:
+                    result[comma] = False
+                waiting.clear()
+                waiting.append(i)
+            else:
+                pending[depth] = [i]
+    return result
+
+
 class Parser:
     """
     Recursive descent parser for YAY.
@@ -18,26 +126,63 @@ class Parser:
     - Significant indentation
     """
 
-    def __init__(self, source: str):
-        self.source = source
-        self.source_lines = source.split("\n")
-        self.lexer = Lexer(source)
-        self.tokens: list[Token] = list(self.lexer.tokenize())
-        self.pos = 0
+    __slots__ = (
+        "source",
+        "lexer",
+        "_line_starts",
+        "_validated_opens",
+        "_clean_spans",
+        "tokens",
+        "pos",
+        "cur",
+        "nxt",
+    )
+
+    def __init__(self, source: str) -> None:
+        self.source: str = source
+        self.lexer: Lexer = Lexer(source)
+        # Offsets where each line starts, plus one past the end of the source
+        # so that line n always ends just before _line_starts[n]
+        self._line_starts: list[int] = self.lexer._line_starts + [len(source) + 1]
+        # Offsets of brackets already covered by a passing inline syntax check
+        self._validated_opens: set[int] = set()
+        # For each opening bracket, the span from a bracket to the end of its
+        # line that the prescreen found nothing suspect in
+        self._clean_spans: dict[str, tuple[int, int]] = {"[": (0, 0), "{": (0, 0)}
+        self.tokens: list[Token] = self.lexer.tokenize_list()
+        self.pos: int = 0
+        # Current and next token, kept in step with pos by advance()
+        self.cur: Token = self.tokens[0]
+        self.nxt: Token = self.tokens[1] if len(self.tokens) > 1 else self.tokens[-1]
 
     def error(self, message: str, token: Token | None = None) -> YaySyntaxError:
         if token is None:
-            token = self.peek()
+            token = self.cur
         return YaySyntaxError(message, token.line, token.col)
 
+    @staticmethod
+    def _bare_word_error(token: Token) -> YaySyntaxError:
+        """Error for an identifier used as a value; strings must be quoted."""
+        first_char = token.value[0] if token.value else "?"
+        return YaySyntaxError(
+            f'Unexpected character "{first_char}"', token.line, token.col
+        )
+
     def char_at(self, line: int, col: int) -> str:
         """Get character at given line (1-based) and column (1-based)."""
-        if line < 1 or line > len(self.source_lines):
-            return ""
-        line_content = self.source_lines[line - 1]
-        if col < 1 or col > len(line_content):
-            return ""
-        return line_content[col - 1]
+        starts = self._line_starts
+        if line < len(starts):
+            start = starts[line - 1]
+            if 0 < col < starts[line] - start:
+                return self.source[start + col - 1]
+        return ""
+
+    def _line(self, line: int) -> str:
+        """Get the text of the given line (1-based), or "" past the end."""
+        starts = self._line_starts
+        if line < len(starts):
+            return self.source[starts[line - 1] : starts[line] - 1]
+        return ""
 
     def check_no_space_after(self, token: Token, char: str) -> None:
         """Check that there's no space immediately after the token."""
@@ -55,6 +200,19 @@ class Parser:
                 f'Unexpected space before "{char}"', token.line, prev_col
             )
 
+    def spacing_after(self, line: int, col: int) -> int:
+        """Classify the spacing after the delimiter at given line and column."""
+        starts = self._line_starts
+        if line >= len(starts):
+            return _SPACE_MISSING
+        start = starts[line - 1] + col
+        following = self.source[start : min(start + 2, starts[line] - 1)]
+        if following[:1] != " ":
+            return _SPACE_MISSING
+        if following == "  ":
+            return _SPACE_DOUBLE
+        return _SPACE_OK
+
     def validate_inline_syntax(
         self, line: int, start_col: int, open_char: str, close_char: str
     ) -> None:
@@ -65,17 +223,40 @@ class Parser:
         2. Space before closing bracket
         3. Comma spacing (with lookahead for trailing space before close)
         """
-        line_content = (
-            self.source_lines[line - 1] if line <= len(self.source_lines) else ""
-        )
-        s = line_content[start_col - 1 :] if start_col <= len(line_content) else ""
+        starts = self._line_starts
+        if line >= len(starts):
+            return
+        s = self.source
+        # Scan the rest of the line in place; columns are offsets from base
+        base = starts[line - 1] - 1
+        start = base + start_col
+        n = starts[line] - 1
+        # A passing scan from an enclosing or earlier bracket on this line
+        # already checked everything a scan from here would
+        validated = self._validated_opens
+        if start in validated:
+            return
+        # Nor can a later bracket on a line the prescreen passed from an
+        # earlier one, since it would search a suffix of the same span
+        clean_start, clean_end = self._clean_spans[open_char]
+        if clean_start <= start < clean_end:
+            return
+        if not _INLINE_SUSPECT[open_char].search(s, start, n):
+            self._clean_spans[open_char] = (start, n)
+            return
+        opens: list[int] = []
 
         in_single = False
         in_double = False
         escape = False
         depth = 0
+        special = _INLINE_SPECIAL[open_char]
+        # Comma positions mapped to whether the bracket closing them has a
+        # space before it; computed on first use
+        closes_with_space: dict[int, bool] | None = None
 
-        for i, ch in enumerate(s):
+        for i in range(start, n):
+            ch = s[i]
             if escape:
                 escape = False
                 continue
@@ -91,6 +272,8 @@ class Parser:
                 elif ch == '"':
                     in_double = False
                 continue
+            if ch not in special:
+                continue
             if ch == "'":
                 in_single = True
                 continue
@@ -99,123 +282,97 @@ class Parser:
                 continue
             if ch == open_char:
                 depth += 1
-                if i + 1 < len(s) and s[i + 1] == " ":
+                if i + 1 < n and s[i + 1] == " ":
                     raise YaySyntaxError(
-                        f'Unexpected space after "{open_char}"', line, start_col + i + 1
+                        f'Unexpected space after "{open_char}"', line, i - base + 1
                     )
+                opens.append(i)
                 continue
             if ch == close_char:
-                if i > 0 and s[i - 1] == " ":
+                if i > start and s[i - 1] == " ":
                     raise YaySyntaxError(
-                        f'Unexpected space before "{close_char}"',
-                        line,
-                        start_col + i - 1,
+                        f'Unexpected space before "{close_char}"', line, i - base - 1
                     )
                 if depth > 0:
                     depth -= 1
                 continue
             if ch == ",":
-                if i > 0 and s[i - 1] == " ":
+                if i > start and s[i - 1] == " ":
                     raise YaySyntaxError(
-                        f'Unexpected space before ","', line, start_col + i - 1
+                        'Unexpected space before ","', line, i - base - 1
                     )
-                if i + 1 < len(s) and s[i + 1] != " " and s[i + 1] != close_char:
-                    # Lookahead to see if next closing bracket at same depth has space before it
-                    # If so, report that error instead of missing space after comma
-                    lookahead_depth = depth
-                    in_s = False
-                    in_d = False
-                    esc = False
-                    next_is_closing_with_space = False
-                    for j in range(i + 1, len(s)):
-                        cj = s[j]
-                        if esc:
-                            esc = False
-                            continue
-                        if in_s:
-                            if cj == "\\":
-                                esc = True
-                            elif cj == "'":
-                                in_s = False
-                            continue
-                        if in_d:
-                            if cj == "\\":
-                                esc = True
-                            elif cj == '"':
-                                in_d = False
-                            continue
-                        if cj == "'":
-                            in_s = True
-                            continue
-                        if cj == '"':
-                            in_d = True
-                            continue
-                        if cj == open_char:
-                            lookahead_depth += 1
-                            continue
-                        if cj == close_char:
-                            if lookahead_depth == depth:
-                                next_is_closing_with_space = j > 0 and s[j - 1] == " "
-                                break
-                            if lookahead_depth > 0:
-                                lookahead_depth -= 1
-                            continue
-                        if cj == "," and lookahead_depth == depth:
-                            break
-                    if not next_is_closing_with_space:
+                if i + 1 < n and s[i + 1] != " " and s[i + 1] != close_char:
+                    # If the next closing bracket at the same depth has a space
+                    # before it, report that error instead of the missing space
+                    # after the comma
+                    if closes_with_space is None:
+                        closes_with_space = _comma_closings(
+                            s, start, n, open_char, close_char
+                        )
+                    if not closes_with_space.get(i, False):
                         raise YaySyntaxError(
-                            f'Expected space after ","', line, start_col + i + 1
+                            'Expected space after ","', line, i - base + 1
                         )
-                if i + 2 < len(s) and s[i + 1] == " " and s[i + 2] == " ":
+                if i + 2 < n and s[i + 1] == " " and s[i + 2] == " ":
                     raise YaySyntaxError(
-                        f'Unexpected space after ","', line, start_col + i + 2
+                        'Unexpected space after ","', line, i - base + 2
                     )
                 continue
 
-    def peek(self, offset: int = 0) -> Token:
-        """Peek at token at current position + offset."""
-        idx = self.pos + offset
-        if idx >= len(self.tokens):
-            return self.tokens[-1]  # EOF
-        return self.tokens[idx]
+        validated.update(opens)
 
     def advance(self) -> Token:
         """Consume and return current token."""
-        token = self.peek()
-        self.pos += 1
+        token = self.cur
+        pos = self.pos + 1
+        self.pos = pos
+        self.cur = self.nxt
+        try:
+            self.nxt = self.tokens[pos + 1]
+        except IndexError:
+            self.nxt = self.tokens[-1]  # EOF
         return token
 
-    def expect(self, kind: str) -> Token:
+    def expect(self, kind: int) -> Token:
         """Consume token of expected kind or raise error."""
-        token = self.peek()
+        token = self.cur
         if token.kind != kind:
-            raise self.error(f"Expected {kind}, got {token.kind}")
+            raise self.error(
+                f"Expected {KIND_NAMES[kind]}, got {KIND_NAMES[token.kind]}"
+            )
         return self.advance()
 
     def skip_newlines(self) -> None:
         """Skip NEWLINE and INDENT tokens."""
-        while self.peek().kind in ("NEWLINE", "INDENT"):
-            self.advance()
+        token = self.cur
+        if token.kind != K_NEWLINE and token.kind != K_INDENT:
+            return
+        tokens = self.tokens
+        pos = self.pos
+        # The EOF token ends every token list, so this stays in bounds
+        while token.kind == K_NEWLINE or token.kind == K_INDENT:
+            pos += 1
+            token = tokens[pos]
+        self.pos = pos
+        self.cur = token
+        self.nxt = tokens[pos + 1] if pos + 1 < len(tokens) else tokens[-1]
 
     def parse(self) -> Any:
         """Parse the entire document."""
-        # Check if document is comment-only (has content but no values)
-        has_content = bool(self.source.strip())
-
         # Skip leading newlines only (not indents)
-        while self.peek().kind == "NEWLINE":
+        while self.cur.kind == K_NEWLINE:
             self.advance()
 
         # Check for unexpected indentation at root level
-        if self.peek().kind == "INDENT":
-            indent = self.peek().value
+        if self.cur.kind == K_INDENT:
+            indent = self.cur.value
             if indent > 0:
-                raise YaySyntaxError("Unexpected indent", self.peek().line, 1)
+                raise YaySyntaxError("Unexpected indent", self.cur.line, 1)
             self.advance()
 
-        if self.peek().kind == "EOF":
+        if self.cur.kind == K_EOF:
             # If there was content (comments) but no value, that's an error
-            if has_content:
+            if self.source.strip():
                 raise YaySyntaxError("No value found in document", 1, 1)
             return None
 
@@ -224,86 +381,62 @@ class Parser:
         # Skip trailing whitespace
         self.skip_newlines()
 
-        if self.peek().kind != "EOF":
+        if self.cur.kind != K_EOF:
             raise self.error("Unexpected extra content")
 
         return result
 
     def parse_value(self, min_indent: int) -> Any:
         """Parse a value at the given indentation level."""
-        token = self.peek()
-
-        # Inline values
-        if token.kind == "NULL":
-            self.advance()
-            return None
-
-        if token.kind == "BOOL":
-            self.advance()
-            return token.value
+        token = self.cur
 
-        if token.kind == "INT":
-            self.advance()
-            return token.value
-
-        if token.kind == "FLOAT":
-            self.advance()
-            return token.value
-
-        if token.kind == "STRING":
+        # Inline values; the scalar kinds carry their Python value
+        if token.kind <= K_BYTES:
             # Check if this is a quoted object key
-            if self.peek(1).kind == "COLON":
+            if token.kind == K_STRING and self.nxt.kind == K_COLON:
                 return self.parse_block_object(min_indent)
             self.advance()
             return token.value
 
-        if token.kind == "BYTES":
-            self.advance()
-            return token.value
-
         # Inline array
-        if token.kind == "LBRACKET":
+        if token.kind == K_LBRACKET:
             return self.parse_inline_array()
 
         # Inline object
-        if token.kind == "LBRACE":
+        if token.kind == K_LBRACE:
             return self.parse_inline_object()
 
         # Block array (starts with dash)
-        if token.kind == "DASH":
+        if token.kind == K_DASH:
             return self.parse_block_array(min_indent)
 
         # Block string (quote alone or with content)
-        if token.kind == "IDENT" and token.value == "":
+        if token.kind == K_IDENT and token.value == "":
             # This shouldn't happen, but handle gracefully
             raise self.error("Empty identifier")
 
         # Identifier could be object key
-        if token.kind == "IDENT":
+        if token.kind == K_IDENT:
             # Look ahead to see if this is a key: value pair
-            if self.peek(1).kind == "COLON":
+            if self.nxt.kind == K_COLON:
                 return self.parse_block_object(min_indent)
-            elif self.peek(1).kind == "IDENT":
+            elif self.nxt.kind == K_IDENT:
                 # Invalid key character (space in key name)
                 # The space is at the position between the two identifiers
                 space_col = token.col + len(token.value)
                 raise YaySyntaxError("Invalid key character", token.line, space_col)
             else:
-                # Bare words are not valid - strings must be quoted
-                first_char = token.value[0] if token.value else "?"
-                raise YaySyntaxError(
-                    f'Unexpected character "{first_char}"', token.line, token.col
-                )
+                raise self._bare_word_error(token)
 
-        raise self.error(f"Unexpected token: {token.kind}")
+        raise self.error(f"Unexpected token: {KIND_NAMES[token.kind]}")
 
     def parse_inline_array(self) -> list:
         """Parse an inline array [a, b, c]."""
-        lbracket = self.peek()
-        self.expect("LBRACKET")
+        lbracket = self.cur
+        self.expect(K_LBRACKET)
 
         # Check for newline immediately after [ (multiline inline array is invalid)
-        if self.peek().kind == "NEWLINE":
+        if self.cur.kind == K_NEWLINE:
             raise YaySyntaxError(
                 "Unexpected newline in inline array", lbracket.line, lbracket.col
             )
@@ -313,31 +446,33 @@ class Parser:
 
         items = []
 
-        while self.peek().kind != "RBRACKET":
-            if self.peek().kind == "EOF":
+        while self.cur.kind != K_RBRACKET:
+            if self.cur.kind == K_EOF:
                 raise self.error("Unterminated array")
-            if self.peek().kind == "NEWLINE":
+            if self.cur.kind == K_NEWLINE:
                 raise YaySyntaxError(
                     "Unexpected newline in inline array", lbracket.line, lbracket.col
                 )
 
             items.append(self.parse_inline_value())
 
-            if self.peek().kind == "COMMA":
+            if self.cur.kind == K_COMMA:
                 self.advance()
-            elif self.peek().kind != "RBRACKET":
-                raise self.error(f"Expected ',' or ']', got {self.peek().kind}")
+            elif self.cur.kind != K_RBRACKET:
+                raise self.error(
+                    f"Expected ',' or ']', got {KIND_NAMES[self.cur.kind]}"
+                )
 
-        self.expect("RBRACKET")
+        self.expect(K_RBRACKET)
         return items
 
     def parse_inline_object(self) -> dict:
         """Parse an inline object {a: 1, b: 2}."""
-        lbrace = self.peek()
-        self.expect("LBRACE")
+        lbrace = self.cur
+        self.expect(K_LBRACE)
 
         # Check for newline immediately after { (multiline inline object is invalid)
-        if self.peek().kind == "NEWLINE":
+        if self.cur.kind == K_NEWLINE:
             raise YaySyntaxError(
                 "Unexpected newline in inline object", lbrace.line, lbrace.col
             )
@@ -347,10 +482,10 @@ class Parser:
 
         obj = {}
 
-        while self.peek().kind != "RBRACE":
-            if self.peek().kind == "EOF":
+        while self.cur.kind != K_RBRACE:
+            if self.cur.kind == K_EOF:
                 raise self.error("Unterminated object")
-            if self.peek().kind == "NEWLINE":
+            if self.cur.kind == K_NEWLINE:
                 raise YaySyntaxError(
                     "Unexpected newline in inline object", lbrace.line, lbrace.col
                 )
@@ -359,115 +494,103 @@ class Parser:
             key = self.parse_key()
 
             # Check colon spacing
-            colon = self.peek()
-            if colon.kind != "COLON":
+            colon = self.cur
+            if colon.kind != K_COLON:
                 raise YaySyntaxError(
                     "Expected colon after key", lbrace.line, lbrace.col
                 )
-            self.expect("COLON")
+            self.advance()
             self.check_no_space_before(colon, ":")
             # Colon must be followed by exactly one space
-            next_col = colon.col + 1
-            if self.char_at(colon.line, next_col) != " ":
-                raise YaySyntaxError('Expected space after ":"', colon.line, next_col)
-            if self.char_at(colon.line, next_col + 1) == " ":
+            spacing = self.spacing_after(colon.line, colon.col)
+            if spacing == _SPACE_MISSING:
                 raise YaySyntaxError(
-                    'Unexpected space after ":"', colon.line, next_col + 1
+                    'Expected space after ":"', colon.line, colon.col + 1
+                )
+            if spacing == _SPACE_DOUBLE:
+                raise YaySyntaxError(
+                    'Unexpected space after ":"', colon.line, colon.col + 2
                 )
 
             # Parse value
-            value = self.parse_inline_value()
-            obj[key] = value
+            obj[key] = self.parse_inline_value()
 
-            if self.peek().kind == "COMMA":
+            if self.cur.kind == K_COMMA:
                 self.advance()
-            elif self.peek().kind != "RBRACE":
-                raise self.error(f"Expected ',' or '}}', got {self.peek().kind}")
+            elif self.cur.kind != K_RBRACE:
+                raise self.error(
+                    f"Expected ',' or '}}', got {KIND_NAMES[self.cur.kind]}"
+                )
 
-        self.expect("RBRACE")
+        self.expect(K_RBRACE)
         return obj
 
     def parse_inline_value(self) -> Any:
         """Parse an inline value (no block forms)."""
-        token = self.peek()
+        token = self.cur
 
-        if token.kind == "NULL":
-            self.advance()
-            return None
-
-        if token.kind == "BOOL":
-            self.advance()
-            return token.value
-
-        if token.kind == "INT":
-            self.advance()
-            return token.value
-
-        if token.kind == "FLOAT":
-            self.advance()
-            return token.value
-
-        if token.kind == "STRING":
-            self.advance()
-            return token.value
-
-        if token.kind == "BYTES":
+        # The scalar kinds carry their Python value
+        if token.kind <= K_BYTES:
             self.advance()
             return token.value
 
-        if token.kind == "LBRACKET":
+        if token.kind == K_LBRACKET:
             return self.parse_inline_array()
 
-        if token.kind == "LBRACE":
+        if token.kind == K_LBRACE:
             return self.parse_inline_object()
 
-        raise self.error(f"Expected value, got {token.kind}")
+        raise self.error(f"Expected value, got {KIND_NAMES[token.kind]}")
 
     def parse_key(self) -> str:
         """Parse an object key (identifier or quoted string)."""
-        token = self.peek()
+        token = self.cur
 
-        if token.kind == "IDENT":
+        if token.kind == K_IDENT:
             self.advance()
             return token.value
 
-        if token.kind == "STRING":
+        if token.kind == K_STRING:
             self.advance()
             return token.value
 
-        raise self.error(f"Expected key, got {token.kind}")
+        raise self.error(f"Expected key, got {KIND_NAMES[token.kind]}")
 
     def parse_block_array(self, base_indent: int) -> list:
         """Parse a block array (dash-prefixed items)."""
         items = []
+        append = items.append
+        advance = self.advance
+        spacing_after = self.spacing_after
+        parse_array_item = self.parse_array_item
 
         while True:
-            token = self.peek()
+            token = self.cur
 
             # Check if we're still in the array
-            if token.kind == "INDENT":
+            if token.kind == K_INDENT:
                 indent = token.value
                 if indent < base_indent:
                     break
                 if indent > base_indent and items:
                     # This is continuation of previous item
                     break
-                self.advance()
-                token = self.peek()
+                advance()
+                token = self.cur
 
-            if token.kind != "DASH":
+            if token.kind != K_DASH:
                 break
 
             dash_token = token
-            self.advance()  # consume dash
+            advance()  # consume dash
 
             # Check for exactly one space after dash
-            next_col = dash_token.col + 1
-            if self.char_at(dash_token.line, next_col) != " ":
+            spacing = spacing_after(dash_token.line, dash_token.col)
+            if spacing == _SPACE_MISSING:
                 raise YaySyntaxError(
-                    'Expected space after "-"', dash_token.line, next_col
+                    'Expected space after "-"', dash_token.line, dash_token.col + 1
                 )
-            if self.char_at(dash_token.line, next_col + 1) == " ":
+            if spacing == _SPACE_DOUBLE:
                 # Check if this is the first dash at the root level (leading space error)
                 # or a nested/indented dash (space after dash error)
                 if base_indent == 0 and dash_token.col == 1:
@@ -478,56 +601,57 @@ class Parser:
                     )
 
             # Parse the item value
-            item = self.parse_array_item(base_indent + 2)
-            items.append(item)
+            append(parse_array_item(base_indent + 2))
 
             # Skip to next line
-            if self.peek().kind == "NEWLINE":
-                self.advance()
+            if self.cur.kind == K_NEWLINE:
+                advance()
 
         return items
 
     def parse_array_item(self, item_indent: int) -> Any:
         """Parse a single array item value."""
-        token = self.peek()
+        token = self.cur
 
         # Nested array (dash immediately after dash)
-        if token.kind == "DASH":
+        if token.kind == K_DASH:
             return self.parse_block_array(item_indent)
 
         # Inline values
-        if token.kind in ("NULL", "BOOL", "INT", "FLOAT", "STRING", "BYTES"):
+        if token.kind <= K_BYTES:
             return self.parse_inline_value()
 
-        if token.kind == "LBRACKET":
+        if token.kind == K_LBRACKET:
             return self.parse_inline_array()
 
-        if token.kind == "LBRACE":
+        if token.kind == K_LBRACE:
             return self.parse_inline_object()
 
         # Object value
-        if token.kind == "IDENT" and self.peek(1).kind == "COLON":
+        if token.kind == K_IDENT and self.nxt.kind == K_COLON:
             return self.parse_block_object(item_indent)
 
         # Bare words are not valid - strings must be quoted
-        if token.kind == "IDENT":
-            first_char = token.value[0] if token.value else "?"
-            raise YaySyntaxError(
-                f'Unexpected character "{first_char}"', token.line, token.col
-            )
+        if token.kind == K_IDENT:
+            raise self._bare_word_error(token)
 
-        raise self.error(f"Expected array item value, got {token.kind}")
+        raise self.error(f"Expected array item value, got {KIND_NAMES[token.kind]}")
 
     def parse_block_object(self, base_indent: int) -> dict:
         """Parse a block object (key: value pairs)."""
         obj = {}
         current_indent = base_indent
+        advance = self.advance
+        parse_key = self.parse_key
+        check_no_space_before = self.check_no_space_before
+        spacing_after = self.spacing_after
+        parse_object_value = self.parse_object_value
 
         while True:
-            token = self.peek()
+            token = self.cur
 
             # Handle indentation
-            if token.kind == "INDENT":
+            if token.kind == K_INDENT:
                 indent = token.value
                 if indent < base_indent:
                     break
@@ -535,66 +659,55 @@ class Parser:
                     # This shouldn't happen at object level
                     break
                 current_indent = indent
-                self.advance()
-                token = self.peek()
+                advance()
+                token = self.cur
 
             # Check for key
-            if token.kind not in ("IDENT", "STRING"):
+            if token.kind != K_IDENT and token.kind != K_STRING:
                 break
 
             # Check this is actually a key (followed by colon)
-            if self.peek(1).kind != "COLON":
+            if self.nxt.kind != K_COLON:
                 break
 
-            key_token = self.peek()
-            key = self.parse_key()
+            key = parse_key()
 
-            # Check colon and spacing
-            colon = self.peek()
-            self.expect("COLON")
+            # Check colon and spacing (the lookahead above saw the colon)
+            colon = self.cur
+            advance()
 
-            # Check for space before colon (only for unquoted keys)
-            if key_token.kind == "IDENT":
-                self.check_no_space_before(colon, ":")
-            else:
-                # For quoted keys, check space before colon
-                prev_col = colon.col - 1
-                if prev_col >= 1 and self.char_at(colon.line, prev_col) == " ":
-                    raise YaySyntaxError(
-                        f'Unexpected space before ":"', colon.line, prev_col
-                    )
+            # Check for space before colon (same rule for quoted keys)
+            check_no_space_before(colon, ":")
 
             # Check for exactly one space after colon (if value is on same line)
-            next_token = self.peek()
-            if next_token.kind != "NEWLINE":
-                next_col = colon.col + 1
-                if self.char_at(colon.line, next_col) != " ":
+            if self.cur.kind != K_NEWLINE:
+                spacing = spacing_after(colon.line, colon.col)
+                if spacing == _SPACE_MISSING:
                     raise YaySyntaxError(
-                        'Expected space after ":"', colon.line, next_col
+                        'Expected space after ":"', colon.line, colon.col + 1
                     )
-                if self.char_at(colon.line, next_col + 1) == " ":
+                if spacing == _SPACE_DOUBLE:
                     raise YaySyntaxError(
-                        'Unexpected space after ":"', colon.line, next_col + 1
+                        'Unexpected space after ":"', colon.line, colon.col + 2
                     )
 
             # Parse value
-            value = self.parse_object_value(current_indent)
-            obj[key] = value
+            obj[key] = parse_object_value(current_indent)
 
             # Skip newline
-            if self.peek().kind == "NEWLINE":
-                self.advance()
+            if self.cur.kind == K_NEWLINE:
+                advance()
 
         return obj
 
     def parse_object_value(self, key_indent: int) -> Any:
         """Parse the value part of a key: value pair."""
-        token = self.peek()
+        token = self.cur
 
         # Empty object
-        if token.kind == "LBRACE":
-            next_token = self.peek(1)
-            if next_token.kind == "RBRACE":
+        if token.kind == K_LBRACE:
+            next_token = self.nxt
+            if next_token.kind == K_RBRACE:
                 # Validate no space inside empty object
                 if next_token.col != token.col + 1:
                     raise YaySyntaxError(
@@ -606,70 +719,54 @@ class Parser:
             return self.parse_inline_object()
 
         # Inline values on same line
-        if token.kind in ("NULL", "BOOL", "INT", "FLOAT"):
+        if token.kind <= K_FLOAT:
             return self.parse_inline_value()
 
-        if token.kind == "STRING":
-            # Check if this is a block string with content on same line (invalid in property context)
-            # Block strings start with ` or " followed by space and content
-            line_content = (
-                self.source_lines[token.line - 1]
-                if token.line <= len(self.source_lines)
-                else ""
-            )
-            if token.col <= len(line_content):
-                char_at_token = line_content[token.col - 1] if token.col > 0 else ""
-                if char_at_token == "`":
-                    # Backtick block string - check if there's content after it on the same line
-                    rest_of_line = line_content[token.col :]
-                    if rest_of_line.startswith(" ") and len(rest_of_line.strip()) > 0:
-                        raise YaySyntaxError(
-                            "Expected newline after block leader in property",
-                            token.line,
-                            token.col,
-                        )
+        if token.kind == K_STRING:
+            # A block string with content on the same line is invalid in
+            # property context
+            if token.lead_char == LEAD_BACKTICK:
+                rest_of_line = self._line(token.line)[token.col :]
+                if rest_of_line.startswith(" ") and len(rest_of_line.strip()) > 0:
+                    raise YaySyntaxError(
+                        "Expected newline after block leader in property",
+                        token.line,
+                        token.col,
+                    )
             return self.parse_inline_value()
 
-        if token.kind == "BYTES":
-            # Check if this is a block byte array with content on same line (invalid in property context)
-            # Block byte arrays start with > followed by content
-            line_content = (
-                self.source_lines[token.line - 1]
-                if token.line <= len(self.source_lines)
-                else ""
-            )
-            if token.col <= len(line_content):
-                char_at_token = line_content[token.col - 1] if token.col > 0 else ""
-                if char_at_token == ">":
-                    # Check if there's hex content after > on the same line
-                    rest_of_line = line_content[token.col :]
-                    # Skip optional space
-                    if rest_of_line.startswith(" "):
-                        rest_of_line = rest_of_line[1:]
-                    # Check if there's hex content (not just a comment or empty)
-                    if rest_of_line and rest_of_line[0] in "0123456789abcdef":
-                        raise YaySyntaxError(
-                            "Expected newline after block leader in property",
-                            token.line,
-                            token.col,
-                        )
+        if token.kind == K_BYTES:
+            # A block byte array with hex content on the same line is invalid
+            # in property context
+            if token.lead_char == LEAD_GT:
+                rest_of_line = self._line(token.line)[token.col :]
+                # Skip optional space
+                if rest_of_line.startswith(" "):
+                    rest_of_line = rest_of_line[1:]
+                # Check if there's hex content (not just a comment or empty)
+                if rest_of_line and rest_of_line[0] in "0123456789abcdef":
+                    raise YaySyntaxError(
+                        "Expected newline after block leader in property",
+                        token.line,
+                        token.col,
+                    )
             return self.parse_inline_value()
 
-        if token.kind == "LBRACKET":
+        if token.kind == K_LBRACKET:
             return self.parse_inline_array()
 
         # Block string starting with quote
         # (handled by lexer as STRING token)
 
         # Newline means nested block value
-        if token.kind == "NEWLINE":
+        if token.kind == K_NEWLINE:
             self.advance()
 
             # Check indent of next line
-            if self.peek().kind != "INDENT":
+            if self.cur.kind != K_INDENT:
                 raise self.error("Expected value after property")
 
-            indent_token = self.peek()
+            indent_token = self.cur
             child_indent = indent_token.value
 
             # For named arrays, the array can be at same indent as key
@@ -679,18 +776,20 @@ class Parser:
 
             self.advance()  # consume INDENT
 
-            next_token = self.peek()
+            next_token = self.cur
 
             # Block array (can be at same indent for named arrays)
-            if next_token.kind == "DASH":
+            if next_token.kind == K_DASH:
                 return self.parse_block_array(child_indent)
 
             # Block object
-            if next_token.kind in ("IDENT", "STRING") and self.peek(1).kind == "COLON":
+            if (
+                next_token.kind == K_IDENT or next_token.kind == K_STRING
+            ) and self.nxt.kind == K_COLON:
                 return self.parse_block_object(child_indent)
 
             # Concatenated quoted strings (multiple quoted strings on consecutive lines)
-            if next_token.kind == "STRING":
+            if next_token.kind == K_STRING:
                 result = self.parse_concatenated_strings(child_indent)
                 if result is not None:
                     return result
@@ -698,40 +797,54 @@ class Parser:
 
             raise self.error("Unexpected indent")
 
-        raise self.error(f"Expected value after colon, got {token.kind}")
+        raise self.error(f"Expected value after colon, got {KIND_NAMES[token.kind]}")
 
     def parse_concatenated_strings(self, base_indent: int) -> str | None:
         """Parse multiple quoted strings on consecutive lines.
 
         Returns None if there's only one string (single string on new line is invalid).
         """
-        parts = []
+        # The first two strings are held directly; most concatenations have
+        # only two, so the list is only started for a third
+        first = None
+        second = None
+        parts = None
+        advance = self.advance
 
         while True:
-            token = self.peek()
+            token = self.cur
 
             # Skip newlines and check indent
-            if token.kind == "NEWLINE":
-                self.advance()
-                if self.peek().kind != "INDENT":
+            if token.kind == K_NEWLINE:
+                advance()
+                if self.cur.kind != K_INDENT:
                     break
-                indent_token = self.peek()
+                indent_token = self.cur
                 if indent_token.value < base_indent:
                     break
-                self.advance()  # consume INDENT
-                token = self.peek()
+                advance()  # consume INDENT
+                token = self.cur
 
-            if token.kind != "STRING":
+            if token.kind != K_STRING:
                 break
 
-            parts.append(token.value)
-            self.advance()
+            if first is None:
+                first = token.value
+            elif second is None:
+                second = token.value
+            elif parts is None:
+                parts = [first, second, token.value]
+            else:
+                parts.append(token.value)
+            advance()
 
         # Require at least 2 strings for concatenation
         # A single string on a new line is invalid (use inline syntax instead)
-        if len(parts) < 2:
+        if second is None:
             return None
 
+        if parts is None:
+            return first + second
         return "".join(parts)
 
 
@@ -745,3 +858,102 @@ def loads(s: str) -> Any:
 def load(fp: TextIO) -> Any:
     """Parse a YAY file into Python objects."""
     return loads(fp.read())
+
+
+@lru_cache(maxsize=256)
+def _compile_loader(keys: tuple[str, ...]) -> Callable[[str], Any]:
+    """Generate and compile the loader for one key sequence."""
+    if not keys:
+        return loads
+    # The generated code follows Parser.parse and Parser.parse_block_object
+    # step for step for a root object with exactly these keys, and hands any
+    # other document to loads() before it could diverge.
+    source = [
+        "def load(source):",
+        "    parser = Parser(source)",
+        "    advance = parser.advance",
+        "    while parser.cur.kind == K_NEWLINE:",
+        "        advance()",
+        "    if parser.cur.kind == K_INDENT:",
+        "        if parser.cur.value > 0:",
+        "            return loads(source)",
+        "        advance()",
+    ]
+    for i, key in enumerate(keys):
+        source.append("    token = parser.cur")
+        if i:
+            source += [
+                "    if token.kind == K_INDENT:",
+                "        if token.value != 0:",
+                "            return loads(source)",
+                "        advance()",
+                "        token = parser.cur",
+            ]
+        source += [
+            "    if (",
+            "        (token.kind != K_IDENT and token.kind != K_STRING)",
+            f"        or token.value != {key!r}",
+            "        or parser.nxt.kind != K_COLON",
+            "    ):",
+            "        return loads(source)",
+            "    advance()",
+            "    colon = parser.cur",
+            "    advance()",
+            '    parser.check_no_space_before(colon, ":")',
+            "    if parser.cur.kind != K_NEWLINE:",
+            "        spacing = parser.spacing_after(colon.line, colon.col)",
+            "        if spacing == _SPACE_MISSING:",
+            "            raise YaySyntaxError(",
+            "                'Expected space after \":\"', colon.line, colon.col + 1",
+            "            )",
+            "        if spacing == _SPACE_DOUBLE:",
+            "            raise YaySyntaxError(",
+            "                'Unexpected space after \":\"', colon.line, colon.col + 2",
+            "            )",
+            f"    value{i} = parser.parse_object_value(0)",
+            "    if parser.cur.kind == K_NEWLINE:",
+            "        advance()",
+        ]
+    entries = ", ".join(f"{key!r}: value{i}" for i, key in enumerate(keys))
+    source += [
+        "    parser.skip_newlines()",
+        "    if parser.cur.kind != K_EOF:",
+        "        return loads(source)",
+        f"    return {{{entries}}}",
+    ]
+    namespace = {
+        "Parser": Parser,
+        "YaySyntaxError": YaySyntaxError,
+        "loads": loads,
+        "K_COLON": K_COLON,
+        "K_EOF": K_EOF,
+        "K_IDENT": K_IDENT,
+        "K_INDENT": K_INDENT,
+        "K_NEWLINE": K_NEWLINE,
+        "K_STRING": K_STRING,
+        "_SPACE_DOUBLE": _SPACE_DOUBLE,
+        "_SPACE_MISSING": _SPACE_MISSING,
+    }
+    exec(compile("\n".join(source), "<yay loader>", "exec"), namespace)
+    return namespace["load"]
+
+
+def compile_loader(keys: Iterable[str]) -> Callable[[str], Any]:
+    """
+    Compile a parser specialized for documents holding one object with a
+    fixed set of keys.
+
+    The returned function gives exactly the result of loads(), including
+    errors, for any document.  When the document is a block object with the
+    given keys, in the given order, the key checks and value dispatch are
+    resolved at compile time, which pays off when parsing many records of the
+    same shape.  Any other document is parsed by loads().  Compiled loaders
+    are cached by key sequence.
+
+    Args:
+        keys: The object keys, in document order
+
+    Returns:
+        A function parsing one YAY string
+    """
+    return _compile_loader(tuple(keys))
@@ -6,14 +6,57 @@ Runs against all .yay fixture files and compares with expected .js output.
 Runs against all .nay fixture files and verifies errors are raised.
 """
 
+import io
 import json
 import math
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 sys.path.insert(0, os.path.dirname(__file__))
 import libyay as yay
+from libyay.lexer import IncrementalLexer, Lexer
+from libyay.parser import _INLINE_SUSPECT
+
+# The message part of an expected error, before its "at LINE:COL" location
+_AT_LINE_COL_RE = re.compile(r"^(.+?)\s+at\s+\d+:\d+")
+
+# An unquoted key at the start of a line, for key sets of error fixtures
+_TOP_LEVEL_KEY_RE = re.compile(r"^(\w+) *:", re.M)
+
+# A key set no fixture document matches
+_UNMATCHED_KEYS = ("no such key",)
+
+# Expected values written as a single JavaScript literal
+_JS_LITERALS = {
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+    "NaN": float("nan"),
+    "null": None,
+    "true": True,
+    "false": False,
+    "new Uint8Array(0)": b"",
+}
+_NOT_LITERAL = object()
+
+# A whole BigInt literal, capturing its digits and sign
+_BIGINT_RE = re.compile(r"(-?\d+)n")
+
+# A quoted string (either quote, with backslash escapes, possibly
+# unterminated), or the 'n' suffix of a BigInt literal
+_JS_SCAN_RE = re.compile(r"""(["'])((?:\\.|(?!\1)[^\\])*)(\1?)|(?<=\d)n+""", re.S)
+
+# A digit run long enough to overflow 64 bits, which orjson would read as a
+# float; such values are left to the json module
+_LONG_DIGITS_RE = re.compile(r"\d{19}")
 
 
 def parse_js_value(js_content: str):
@@ -29,27 +72,10 @@ def parse_js_value(js_content: str):
     """
     js_content = js_content.strip()
 
-    # Handle special float values
-    if js_content == "Infinity":
-        return float("inf")
-    if js_content == "-Infinity":
-        return float("-inf")
-    if js_content == "NaN":
-        return float("nan")
-
-    # Handle null
-    if js_content == "null":
-        return None
-
-    # Handle booleans
-    if js_content == "true":
-        return True
-    if js_content == "false":
-        return False
-
-    # Handle empty Uint8Array
-    if js_content == "new Uint8Array(0)":
-        return b""
+    # Handle special float values, null, booleans, and empty Uint8Array
+    value = _JS_LITERALS.get(js_content, _NOT_LITERAL)
+    if value is not _NOT_LITERAL:
+        return value
 
     # Handle Uint8Array.fromHex("...")
     if js_content.startswith("Uint8Array.fromHex("):
@@ -57,26 +83,21 @@ def parse_js_value(js_content: str):
         return bytes.fromhex(hex_str)
 
     # Handle BigInt literals (e.g., 10n, -10n)
-    if (
-        js_content.endswith("n")
-        and not js_content.startswith('"')
-        and not js_content.startswith("'")
-    ):
-        try:
-            return int(js_content[:-1])
-        except ValueError:
-            pass
-
-    # Handle negative numbers
-    if js_content.startswith("-"):
-        rest = js_content[1:]
-        if rest.endswith("n"):
-            return -int(rest[:-1])
+    match = _BIGINT_RE.fullmatch(js_content)
+    if match:
+        return int(match.group(1))
 
     # Try parsing as JSON (handles strings, numbers, arrays, objects)
+    # First, preprocess to handle BigInt in arrays/objects
+    processed = preprocess_js_for_json(js_content)
+    if orjson is not None and not _LONG_DIGITS_RE.search(processed):
+        # orjson is faster, but rejects NaN/Infinity and lone surrogates,
+        # which the json module below still accepts
+        try:
+            return orjson.loads(processed)
+        except orjson.JSONDecodeError:
+            pass
     try:
-        # First, preprocess to handle BigInt in arrays/objects
-        processed = preprocess_js_for_json(js_content)
         return json.loads(processed)
     except json.JSONDecodeError:
         pass
@@ -96,6 +117,12 @@ def parse_js_value(js_content: str):
     raise ValueError(f"Cannot parse JS value: {js_content!r}")
 
 
+@lru_cache(maxsize=None)
+def parse_expected_js(js_content: str):
+    """Parse an expected .js fixture, reusing earlier results in this process."""
+    return parse_js_value(js_content)
+
+
 def preprocess_js_for_json(js: str) -> str:
     """
     Preprocess JavaScript to be valid JSON.
@@ -104,51 +131,56 @@ def preprocess_js_for_json(js: str) -> str:
     - Quote unquoted object keys
     - Handle single-quoted strings
     """
-    result = []
-    i = 0
-    in_string = False
-    string_char = None
-
-    while i < len(js):
-        ch = js[i]
-
-        if in_string:
-            if ch == "\\" and i + 1 < len(js):
-                result.append(ch)
-                result.append(js[i + 1])
-                i += 2
-                continue
-            if ch == string_char:
-                in_string = False
-                result.append('"')  # Always output double quote
-                i += 1
-                continue
-            result.append(ch)
-            i += 1
-            continue
-
-        if ch in "\"'":
-            in_string = True
-            string_char = ch
-            result.append('"')  # Always output double quote
-            i += 1
-            continue
-
-        # Handle BigInt suffix
-        if ch == "n" and result and result[-1].isdigit():
-            # Skip the 'n'
-            i += 1
-            continue
-
-        result.append(ch)
-        i += 1
-
-    return "".join(result)
+    return _JS_SCAN_RE.sub(_js_token_to_json, js)
+
+
+def _js_token_to_json(match: re.Match) -> str:
+    """Rewrite one string literal or BigInt suffix matched by _JS_SCAN_RE."""
+    if match.group(1) is None:
+        # Drop the BigInt 'n' suffix
+        return ""
+    # Always output double quotes; an unterminated string stays open
+    return '"' + match.group(2) + ('"' if match.group(3) else "")
+
+
+def _floats_equal(a: float, b: float) -> bool:
+    """Compare two floats, treating NaN as equal to NaN."""
+    if math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def _dicts_equal(a: dict, b: dict) -> bool:
+    """Compare two dicts key by key."""
+    if len(a) != len(b):
+        return False
+    for k, v in a.items():
+        if k not in b or not values_equal(v, b[k]):
+            return False
+    return True
+
+
+def _lists_equal(a: list, b: list) -> bool:
+    """Compare two lists item by item."""
+    if len(a) != len(b):
+        return False
+    return all(values_equal(x, y) for x, y in zip(a, b))
+
+
+# Comparisons keyed by exact type; other types compare with ==
+_EQUALITY: dict[type, Callable[[Any, Any], bool]] = {
+    float: _floats_equal,
+    dict: _dicts_equal,
+    list: _lists_equal,
+}
 
 
 def values_equal(a, b) -> bool:
     """Compare two values, handling NaN specially."""
-    if type(a) != type(b):
+    if a is b:
+        return True
+    cls = type(a)
+    if cls is not type(b):
         # Special case: int vs float - compare as floats to handle large numbers
         # where int conversion loses precision (e.g., 6.022e23)
         if isinstance(a, int) and isinstance(b, float):
@@ -157,156 +189,390 @@ def values_equal(a, b) -> bool:
             return a == float(b)
         return False
 
-    if isinstance(a, float):
-        if math.isnan(a) and math.isnan(b):
-            return True
-        return a == b
+    equal = _EQUALITY.get(cls)
+    return equal(a, b) if equal else a == b
 
-    if isinstance(a, dict):
-        if set(a.keys()) != set(b.keys()):
-            return False
-        return all(values_equal(a[k], b[k]) for k in a)
 
-    if isinstance(a, list):
-        if len(a) != len(b):
-            return False
-        return all(values_equal(x, y) for x, y in zip(a, b))
+def _load_all(directory: str, suffix: str) -> dict[str, bytes]:
+    """Read every file in directory whose name ends with suffix, keyed by name."""
+    contents = {}
+    with os.scandir(directory) as entries:
+        # Each entry already carries its joined path
+        paths = sorted(
+            (e.name, e.path) for e in entries if e.name.endswith(suffix) and e.is_file()
+        )
+    for name, path in paths:
+        with open(path, "rb") as fp:
+            contents[name] = fp.read()
+    return contents
 
-    return a == b
+
+def _map_fixtures(check, jobs: int, *iterables):
+    """Apply check across the fixture iterables, in worker processes when jobs > 1."""
+    if jobs <= 1:
+        return map(check, *iterables)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(check, *iterables, chunksize=32))
 
 
-def run_valid_tests(test_root: str, verbose: bool = False) -> tuple[int, int, list]:
+def check_dump(result) -> str | None:
     """
-    Run all .yay tests from test_root/yay/, checking against test_root/js/.
+    Check that dump() writes exactly what dumps() returns, in both block and
+    inline form.
 
-    Returns (passed, failed, errors) where errors is a list of (filename, error_message).
+    Returns an error message, or None if the check passed.
     """
-    passed = 0
-    failed = 0
-    errors = []
+    for indent in (True, False):
+        fp = io.StringIO()
+        yay.dump(result, fp, indent=indent)
+        expected = yay.dumps(result, indent=indent)
+        if fp.getvalue() != expected:
+            return (
+                f"dump(indent={indent}) mismatch: got {fp.getvalue()!r}, "
+                f"expected {expected!r}"
+            )
+    return None
+
+
+def check_compiled_schema(result) -> str | None:
+    """
+    Check that compile_schema() serializes a dict result exactly as dumps().
 
-    yay_dir = os.path.join(test_root, "yay")
-    js_dir = os.path.join(test_root, "js")
-    yay_files = sorted(f for f in os.listdir(yay_dir) if f.endswith(".yay"))
+    The schema is the result's own keys, so fixtures holding an empty object
+    exercise the "{}" serializer and quoted keys exercise key quoting.
+    Returns an error message, or None if the check passed or does not apply.
+    """
+    if not isinstance(result, dict):
+        return None
+    expected = yay.dumps(result)
+    got = yay.compile_schema(tuple(result))(result)
+    if got != expected:
+        return f"compile_schema mismatch: got {got!r}, expected {expected!r}"
+    return None
 
-    for fname in yay_files:
-        yay_path = os.path.join(yay_dir, fname)
-        js_path = os.path.join(js_dir, fname[:-4] + ".js")
 
-        try:
-            with open(yay_path, "rb") as fp:
-                yay_bytes = fp.read()
-            yay_content = yay_bytes.decode("utf-8")
-
-            result = yay.loads(yay_content)
-
-            # Check against expected output if .js file exists
-            if os.path.exists(js_path):
-                with open(js_path) as fp:
-                    js_content = fp.read()
-
-                try:
-                    expected = parse_js_value(js_content)
-                    if not values_equal(result, expected):
-                        failed += 1
-                        errors.append(
-                            (
-                                fname,
-                                f"Value mismatch: got {result!r}, expected {expected!r}",
-                            )
-                        )
-                        continue
-                except ValueError as e:
-                    # Can't parse expected value, just check parsing succeeded
-                    if verbose:
-                        print(f"  {fname}: Could not parse expected JS: {e}")
+class _CountingPattern:
+    """A compiled pattern that counts calls to search()."""
 
-            passed += 1
-            if verbose:
-                print(f"  {fname}: OK -> {result!r}")
+    def __init__(self, pattern: re.Pattern) -> None:
+        self.pattern = pattern
+        self.searches = 0
 
-        except Exception as e:
-            failed += 1
-            errors.append((fname, str(e)))
+    def search(self, *args):
+        self.searches += 1
+        return self.pattern.search(*args)
 
-    return passed, failed, errors
+
+def check_inline_prescreen(source: str) -> str | None:
+    """
+    Check that inline syntax validation prescreens each line at most once per
+    kind of bracket, however many brackets the line holds.
+
+    Returns an error message, or None if the check passed.
+    """
+    originals = dict(_INLINE_SUSPECT)
+    counters = {char: _CountingPattern(p) for char, p in originals.items()}
+    _INLINE_SUSPECT.update(counters)
+    try:
+        yay.loads(source)
+    finally:
+        _INLINE_SUSPECT.update(originals)
+    for char, counter in counters.items():
+        lines = sum(char in line for line in source.splitlines())
+        if counter.searches > lines:
+            return (
+                f"Inline prescreen for {char!r} ran {counter.searches} times "
+                f"over {lines} line(s) containing it"
+            )
+    return None
+
+
+def _load_outcome(load: Callable[[str], Any], source: str) -> str:
+    """Describe the value load returns for source, or the error it raised."""
+    try:
+        return f"value {load(source)!r}"
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def check_compiled_loader(source: str, key_sets: list[tuple[str, ...]]) -> str | None:
+    """
+    Check that compile_loader() gives the same value or error as loads().
+
+    Returns an error message, or None if every key set matched.
+    """
+    expected = _load_outcome(yay.loads, source)
+    for keys in key_sets:
+        got = _load_outcome(yay.compile_loader(keys), source)
+        if got != expected:
+            return f"compile_loader{keys!r} mismatch: got {got}, expected {expected}"
+    return None
+
+
+def _incremental_edits(source: str):
+    """
+    Yield edited copies of source for checking IncrementalLexer.
+
+    At the first non-space character of every line after the first, which
+    covers lines inside backtick and > blocks and dedented lines, insert an
+    "x" or a space or delete that character; at EOF, append a newline or an
+    "x" or delete the last character.
+    """
+    start = source.find("\n") + 1
+    while start:
+        pos = start
+        while pos < len(source) and source[pos] == " ":
+            pos += 1
+        yield source[:pos] + "x" + source[pos:]
+        yield source[:pos] + " " + source[pos:]
+        if pos < len(source):
+            yield source[:pos] + source[pos + 1 :]
+        start = source.find("\n", pos) + 1
+    yield source + "\n"
+    yield source + "x"
+    if source:
+        yield source[:-1]
+
+
+def _fresh_tokens(source: str) -> list:
+    """Tokenize source from scratch."""
+    return Lexer(source).tokenize_list()
+
+
+def _lex_outcome(tokenize: Callable[[str], list], source: str) -> str:
+    """Describe the tokens of source, or the error lexing it raised."""
+    try:
+        tokens = tokenize(source)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return repr([(t.kind, t.value, t.line, t.col, t.lead_char) for t in tokens])
+
+
+def check_incremental_lexer(source: str) -> str | None:
+    """
+    Check that IncrementalLexer matches a fresh Lexer across edits of source.
+
+    Each edit is lexed incrementally from the original, then the original is
+    lexed incrementally again from the edit.
+    Returns an error message, or None if every edit matched.
+    """
+    incremental = IncrementalLexer()
+    original = _lex_outcome(_fresh_tokens, source)
+    if _lex_outcome(incremental.tokenize, source) != original:
+        return "IncrementalLexer mismatch on the unedited source"
+    for edited in _incremental_edits(source):
+        expected = _lex_outcome(_fresh_tokens, edited)
+        if _lex_outcome(incremental.tokenize, edited) != expected:
+            return f"IncrementalLexer mismatch after editing to {edited!r}"
+        if _lex_outcome(incremental.tokenize, source) != original:
+            return f"IncrementalLexer mismatch after reverting {edited!r}"
+    return None
+
+
+def check_token_columns(source: str) -> str | None:
+    """
+    Check that Lexer.tokenize_columns() indexes like tokenize_list().
+
+    Returns an error message, or None if every token matched.
+    """
+    tokens = _fresh_tokens(source)
+    columns = Lexer(source).tokenize_columns()
+    if len(columns) != len(tokens):
+        return f"TokenColumns has {len(columns)} tokens, expected {len(tokens)}"
+    for i, token in enumerate(tokens):
+        if columns[i] != token:
+            return (
+                f"TokenColumns mismatch at {i}: got {columns[i]!r}, "
+                f"expected {token!r}"
+            )
+    return None
+
+
+def check_valid_fixture(
+    verbose: bool, fname: str, yay_bytes: bytes, js_bytes: bytes | None
+) -> tuple[str | None, list[str]]:
+    """
+    Check one .yay fixture against its expected .js value, if any.
+
+    Returns (error, log) where error is None if the fixture passed and log
+    holds the lines to print in verbose mode.
+    """
+    log = []
+
+    try:
+        yay_content = yay_bytes.decode("utf-8")
+
+        result = yay.loads(yay_content)
+
+        # Compile a loader for the document's own keys, for all but the last
+        # of them, and for keys that never match; the latter two must fall
+        # back to loads()
+        key_sets = [_UNMATCHED_KEYS]
+        if isinstance(result, dict):
+            key_sets += [tuple(result), tuple(result)[:-1]]
+        error = (
+            check_dump(result)
+            or check_compiled_schema(result)
+            or check_compiled_loader(yay_content, key_sets)
+            or check_incremental_lexer(yay_content)
+            or check_token_columns(yay_content)
+            or check_inline_prescreen(yay_content)
+        )
+        if error is not None:
+            return error, log
+
+        # Check against expected output if .js file exists
+        if js_bytes is not None:
+            try:
+                expected = parse_expected_js(js_bytes.decode("utf-8"))
+                if not values_equal(result, expected):
+                    return (
+                        f"Value mismatch: got {result!r}, expected {expected!r}",
+                        log,
+                    )
+            except ValueError as e:
+                # Can't parse expected value, just check parsing succeeded
+                if verbose:
+                    log.append(f"  {fname}: Could not parse expected JS: {e}")
+
+        if verbose:
+            log.append(f"  {fname}: OK -> {result!r}")
+        return None, log
+
+    except Exception as e:
+        return str(e), log
 
 
-def run_error_tests(test_root: str, verbose: bool = False) -> tuple[int, int, list]:
+def run_valid_tests(
+    yay_files: dict[str, bytes],
+    js_files: dict[str, bytes],
+    verbose: bool = False,
+    jobs: int = 1,
+) -> tuple[int, int, list]:
     """
-    Run all .nay error tests from test_root/nay/.
+    Run all .yay tests, checking against the .js files of the same name.
 
+    Both arguments map file names to contents, as read by _load_all.
     Returns (passed, failed, errors) where errors is a list of (filename, error_message).
     """
     passed = 0
     failed = 0
     errors = []
 
-    nay_dir = os.path.join(test_root, "nay")
-    nay_files = sorted(f for f in os.listdir(nay_dir) if f.endswith(".nay"))
+    names = list(yay_files)
+    expected = [js_files.get(fname[:-4] + ".js") for fname in names]
+    check = partial(check_valid_fixture, verbose)
+    results = _map_fixtures(check, jobs, names, yay_files.values(), expected)
+    for fname, (error, log) in zip(names, results):
+        for line in log:
+            print(line)
+        if error is None:
+            passed += 1
+        else:
+            failed += 1
+            errors.append((fname, error))
 
-    for fname in nay_files:
-        basename = fname[:-4]  # Remove .nay extension
-        nay_path = os.path.join(nay_dir, fname)
-        error_path = os.path.join(nay_dir, fname[:-4] + ".error")
+    return passed, failed, errors
 
-        try:
-            with open(nay_path, "rb") as fp:
-                nay_bytes = fp.read()
-            nay_content = nay_bytes.decode("utf-8")
-        except UnicodeDecodeError:
-            # Some .nay files may have invalid UTF-8 (like BOM test)
-            # Read as latin-1 to get raw bytes as string
-            with open(nay_path, "rb") as fp:
-                nay_bytes = fp.read()
-            nay_content = nay_bytes.decode("latin-1")
-
-        # Read expected error substring
+
+def check_error_fixture(
+    verbose: bool, fname: str, nay_bytes: bytes, error_bytes: bytes | None
+) -> tuple[str | None, list[str]]:
+    """
+    Check that one .nay fixture fails to parse with the expected error.
+
+    Returns (error, log) where error is None if the fixture passed and log
+    holds the lines to print in verbose mode.
+    """
+    log = []
+
+    try:
+        nay_content = nay_bytes.decode("utf-8")
+    except UnicodeDecodeError:
+        # Some .nay files may have invalid UTF-8 (like BOM test)
+        # Decode as latin-1 to get raw bytes as string
+        nay_content = nay_bytes.decode("latin-1")
+
+    # Expected error substring, if any
+    if error_bytes is not None:
+        expected_error = error_bytes.decode("utf-8").strip()
+    else:
         expected_error = None
-        if os.path.exists(error_path):
-            with open(error_path) as fp:
-                expected_error = fp.read().strip()
 
-        try:
-            result = yay.loads(nay_content)
-            # Should have raised an error
-            failed += 1
-            errors.append((fname, f"Expected error but got result: {result!r}"))
-        except yay.YayError as e:
-            # Check if error message matches expected pattern
-            error_msg = str(e)
-            if expected_error:
-                # Extract the key part of expected error (before "at X:Y of")
-                # e.g., "Unexpected space after \":\"" from full message
-                match = re.match(r"^(.+?)\s+at\s+\d+:\d+", expected_error)
-                if match:
-                    expected_pattern = match.group(1).strip()
-                    if expected_pattern.lower() in error_msg.lower():
-                        passed += 1
-                        if verbose:
-                            print(f"  {fname}: OK (error: {error_msg})")
-                    else:
-                        failed += 1
-                        errors.append(
-                            (
-                                fname,
-                                f"Error mismatch: got '{error_msg}', expected pattern '{expected_pattern}'",
-                            )
-                        )
-                else:
-                    # No "at X:Y" pattern, just check if any error was raised
-                    passed += 1
-                    if verbose:
-                        print(f"  {fname}: OK (error: {error_msg})")
-            else:
-                passed += 1
-                if verbose:
-                    print(f"  {fname}: OK (error: {error_msg})")
-        except Exception as e:
-            # Other exceptions count as pass (we expected an error)
+    # Compiled loaders must raise the same error, also when their keys
+    # match the document's leading entries
+    key_sets = [_UNMATCHED_KEYS]
+    top_level_keys = tuple(_TOP_LEVEL_KEY_RE.findall(nay_content))
+    if top_level_keys:
+        key_sets += [top_level_keys, top_level_keys[:1]]
+    error = check_compiled_loader(nay_content, key_sets)
+    if error is not None:
+        return error, log
+
+    try:
+        result = yay.loads(nay_content)
+        # Should have raised an error
+        return f"Expected error but got result: {result!r}", log
+    except yay.YayError as e:
+        # Check if error message matches expected pattern
+        error_msg = str(e)
+        if expected_error:
+            # Extract the key part of expected error (before "at X:Y of")
+            # e.g., "Unexpected space after \":\"" from full message
+            match = _AT_LINE_COL_RE.match(expected_error)
+            if match:
+                expected_pattern = match.group(1).strip()
+                # Only lower-case both sides if the exact text is missing
+                if (
+                    expected_pattern not in error_msg
+                    and expected_pattern.lower() not in error_msg.lower()
+                ):
+                    return (
+                        f"Error mismatch: got '{error_msg}', expected pattern '{expected_pattern}'",
+                        log,
+                    )
+            # No "at X:Y" pattern, just check if any error was raised
+        if verbose:
+            log.append(f"  {fname}: OK (error: {error_msg})")
+    except Exception as e:
+        # An expected error message means the parser must report it as a
+        # YayError; a stray exception such as a NameError is a bug
+        if expected_error:
+            return f"Expected YayError but got {type(e).__name__}: {e}", log
+        # Other exceptions count as pass (we expected an error)
+        if verbose:
+            log.append(f"  {fname}: OK (exception: {type(e).__name__}: {e})")
+    return None, log
+
+
+def run_error_tests(
+    nay_files: dict[str, bytes],
+    error_files: dict[str, bytes],
+    verbose: bool = False,
+    jobs: int = 1,
+) -> tuple[int, int, list]:
+    """
+    Run all .nay error tests, checking against the .error files of the same name.
+
+    Both arguments map file names to contents, as read by _load_all.
+    Returns (passed, failed, errors) where errors is a list of (filename, error_message).
+    """
+    passed = 0
+    failed = 0
+    errors = []
+
+    names = list(nay_files)
+    expected = [error_files.get(fname[:-4] + ".error") for fname in names]
+    check = partial(check_error_fixture, verbose)
+    results = _map_fixtures(check, jobs, names, nay_files.values(), expected)
+    for fname, (error, log) in zip(names, results):
+        for line in log:
+            print(line)
+        if error is None:
             passed += 1
-            if verbose:
-                print(f"  {fname}: OK (exception: {type(e).__name__}: {e})")
+        else:
+            failed += 1
+            errors.append((fname, error))
 
     return passed, failed, errors
 
@@ -322,6 +588,13 @@ def main():
     parser.add_argument(
         "--test-dir", default="../test", help="Root directory containing test fixtures"
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for running fixtures",
+    )
     args = parser.parse_args()
 
     if args.file:
@@ -349,14 +622,26 @@ def main():
         test_root = os.path.join(os.path.dirname(__file__), args.test_dir)
         print(f"Running tests from {test_root}\n")
 
+        # Read all fixtures up front, so the runs below do no file I/O
+        yay_dir = os.path.join(test_root, "yay")
+        nay_dir = os.path.join(test_root, "nay")
+        yay_files = _load_all(yay_dir, ".yay")
+        js_files = _load_all(os.path.join(test_root, "js"), ".js")
+        nay_files = _load_all(nay_dir, ".nay")
+        error_files = _load_all(nay_dir, ".error")
+
         # Run valid .yay tests
         print("Valid input tests (.yay):")
-        v_passed, v_failed, v_errors = run_valid_tests(test_root, args.verbose)
+        v_passed, v_failed, v_errors = run_valid_tests(
+            yay_files, js_files, args.verbose, args.jobs
+        )
         print(f"  {v_passed} passed, {v_failed} failed")
 
         # Run error .nay tests
         print("\nError tests (.nay):")
-        e_passed, e_failed, e_errors = run_error_tests(test_root, args.verbose)
+        e_passed, e_failed, e_errors = run_error_tests(
+            nay_files, error_files, args.verbose, args.jobs
+        )
         print(f"  {e_passed} passed, {e_failed} failed")
 
         total_passed = v_passed + e_passed
@@ -0,0 +1 @@
+YAY_ARRAY(yay_string("a ,b"), YAY_ARRAY(yay_int(1)), YAY_ARRAY(yay_int(2)))
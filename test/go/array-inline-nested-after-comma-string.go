@@ -0,0 +1 @@
+[]any{"a ,b", []any{big.NewInt(1)}, []any{big.NewInt(2)}}
@@ -0,0 +1 @@
+List.of("a ,b", List.of(BigInteger.valueOf(1)), List.of(BigInteger.valueOf(2)))
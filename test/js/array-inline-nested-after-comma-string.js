@@ -0,0 +1 @@
+["a ,b", [1n], [2n]]
@@ -0,0 +1,5 @@
+Value::Array(vec![
+    Value::String("a ,b".into()),
+    Value::Array(vec![Value::Integer(1.into())]),
+    Value::Array(vec![Value::Integer(2.into())]),
+])